@@ -6,8 +6,17 @@ import time
 import random
 import re
 import threading
+import functools
 import tiktoken
 
+from utils import console_print
+
+# 非详细模式下仍需输出的重要消息关键词
+_IMPORTANT_RE = re.compile("成功|完成|错误|失败|警告|初始化|Token 使用统计")
+
+# 批量请求/响应中的【k】...【/k】标记对
+_MARKER_PAIR_RE = re.compile(r'【\d+】.*?【/\d+】', re.DOTALL)
+
 try:
     from log_utils import get_logger
     
@@ -16,7 +25,7 @@ try:
         logger = get_logger()
         if not verbose:
             # 检查是否为重要消息
-            if not any(key in msg for key in ["成功", "完成", "错误", "失败", "警告", "初始化", "Token 使用统计"]):
+            if not _IMPORTANT_RE.search(msg):
                 return
         logger.log(msg, verbose)
 except ImportError:
@@ -24,47 +33,61 @@ except ImportError:
         """安全打印，处理编码问题"""
         if not verbose:
             # 检查是否为重要消息
-            if not any(key in msg for key in ["成功", "完成", "错误", "失败", "警告", "初始化", "Token 使用统计"]):
+            if not _IMPORTANT_RE.search(msg):
                 return
                 
+        console_print(msg)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding():
+    """获取所有ApiManager共享的tiktoken编码器，首次调用时加载
+    
+    Returns:
+        tiktoken编码器，无法加载时返回None
+    """
+    try:
+        return tiktoken.encoding_for_model("gpt-3.5-turbo")
+    except Exception:
         try:
-            print(msg)
-            import sys
-            sys.stdout.flush()
-        except:
-            print(str(msg).encode('utf-8', 'ignore').decode('utf-8', 'ignore'))
-            import sys
-            sys.stdout.flush()
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+
+
+# 翻译请求使用的系统提示词
+TRANSLATION_SYSTEM_PROMPT = '你是一个专业的学术翻译助手，擅长将英文学术文献准确翻译为符合中文学术习惯的表述。'
 
 
 class ApiManager:
     """API调用管理器"""
     
-    def __init__(self, client, config, verbose=False):
+    def __init__(self, client, config, verbose=False, cache=None):
         """初始化API管理器
         
         Args:
             client: OpenAI客户端实例
             config: 配置字典
             verbose: 是否输出详细日志
+            cache: 响应缓存(如TranslationCache实例)，为None时不缓存API响应
         """
         self.client = client
         self.config = config
         self.verbose = verbose
+        self.cache = cache
+        self.cache_hits = 0
         self.request_count = 0
         self.total_input_tokens = 0
         self.total_output_tokens = 0
-        self.lock = threading.RLock()
+        self.lock = threading.Lock()  # 只保护计数器的简单累加，不会重入
         
         # 初始化token计数器
-        try:
-            self.encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-        except:
-            try:
-                self.encoding = tiktoken.get_encoding("cl100k_base")
-            except:
-                self.encoding = None
-                safe_print("警告：无法初始化token计数器，将使用估算方法", self.verbose)
+        self.encoding = _get_encoding()
+        if self.encoding is None:
+            safe_print("警告：无法初始化token计数器，将使用估算方法", self.verbose)
+        
+        # 系统提示词固定不变，只需计算一次token数
+        self.system_tokens = self.count_tokens(TRANSLATION_SYSTEM_PROMPT)
     
     def call_ai_api(self, prompt, retries=None):
         """调用AI API
@@ -82,9 +105,19 @@ class ApiManager:
         model = self.config.get('ai_model', 'qwen-plus')
         timeout = self.config.get('ai_timeout', 60)
         
+        # 相同模型和提示词的请求直接使用缓存的响应
+        cache_key = None
+        if self.cache is not None and prompt.strip():
+            cache_key = self.cache.get_hash(prompt, model)
+            cached_result = self.cache.get(cache_key)
+            if cached_result:
+                with self.lock:
+                    self.cache_hits += 1
+                safe_print("从缓存获取API响应", self.verbose)
+                return cached_result
+        
         input_tokens = self.count_tokens(prompt)
-        system_tokens = self.count_tokens('你是一个专业的学术翻译助手，擅长将英文学术文献准确翻译为符合中文学术习惯的表述。')
-        total_input = input_tokens + system_tokens
+        total_input = input_tokens + self.system_tokens
         
         # 检查是否为空请求
         if not prompt.strip() or input_tokens == 0:
@@ -96,7 +129,9 @@ class ApiManager:
             self.request_count += 1
             request_id = self.request_count
             
-        safe_print(f"API请求 #{request_id}: 发送 {total_input} tokens", self.verbose)
+        # 以下非关键消息在非详细模式下会被丢弃，提前判断以免白白格式化字符串
+        if self.verbose:
+            safe_print(f"API请求 #{request_id}: 发送 {total_input} tokens", self.verbose)
         
         for attempt in range(retries):
             try:
@@ -104,12 +139,13 @@ class ApiManager:
                 
                 # 设置动态超时：基础超时 + 每1000 token增加10秒
                 dynamic_timeout = timeout + (total_input / 1000) * 10
-                safe_print(f"API请求 #{request_id} 设置动态超时: {dynamic_timeout:.1f}秒", self.verbose)
+                if self.verbose:
+                    safe_print(f"API请求 #{request_id} 设置动态超时: {dynamic_timeout:.1f}秒", self.verbose)
                 
                 response = self.client.chat.completions.create(
                     model=model,
                     messages=[
-                        {'role': 'system', 'content': '你是一个专业的学术翻译助手，擅长将英文学术文献准确翻译为符合中文学术习惯的表述。'},
+                        {'role': 'system', 'content': TRANSLATION_SYSTEM_PROMPT},
                         {'role': 'user', 'content': prompt}
                     ],
                     timeout=dynamic_timeout  # 使用动态超时
@@ -127,7 +163,11 @@ class ApiManager:
                 
                 elapsed_time = time.time() - start_time
                 safe_print(f"API请求 #{request_id} 完成，耗时: {elapsed_time:.2f}秒", self.verbose)
-                safe_print(f"请求 #{request_id}: 输入{total_input}个token, 输出{output_tokens}个token", self.verbose)
+                if self.verbose:
+                    safe_print(f"请求 #{request_id}: 输入{total_input}个token, 输出{output_tokens}个token", self.verbose)
+                
+                if cache_key is not None:
+                    self.cache.set(cache_key, result)
                 
                 return result
                 
@@ -155,20 +195,24 @@ class ApiManager:
         if not result or len(result) < 10:
             safe_print("警告: 翻译结果过短或为空", self.verbose)
             return False
+        
+        # 普通请求不含标记，无需再扫描提示词统计标记对
+        if "【" not in prompt:
+            return True
             
         # 检查是否包含标记格式
-        if "【" in prompt and "】" in prompt:
+        if "】" in prompt:
             if "【" not in result or "】" not in result:
                 safe_print("警告: 翻译结果缺少标记格式", self.verbose)
                 # 轻微的格式问题不一定导致失败
                 # return False
         
         # 计算预期的内容项数量 (通过计算输入中的标记对)
-        expected_items = len(re.findall(r'【\d+】.*?【/\d+】', prompt, re.DOTALL))
+        expected_items = sum(1 for _ in _MARKER_PAIR_RE.finditer(prompt))
         
         # 如果原始请求包含标记但结果没有相应的标记对，验证失败
         if expected_items > 0:
-            actual_items = len(re.findall(r'【\d+】.*?【/\d+】', result, re.DOTALL))
+            actual_items = sum(1 for _ in _MARKER_PAIR_RE.finditer(result))
             
             # 允许有一定的容错性，只要返回了大部分内容
             if actual_items < expected_items * 0.8:  # 80%容错阈值
@@ -187,23 +231,31 @@ class ApiManager:
             int: token数量
         """
         try:
-            if hasattr(self, 'encoding') and self.encoding:
+            if self.encoding:
                 return len(self.encoding.encode(text))
-            else:
-                try:
-                    self.encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-                    return len(self.encoding.encode(text))
-                except:
-                    try:
-                        self.encoding = tiktoken.get_encoding("cl100k_base")
-                        return len(self.encoding.encode(text))
-                    except:
-                        safe_print("警告：无法使用tiktoken，使用简单字符数量估算", self.verbose)
-                        return len(text) // 4
+            safe_print("警告：无法使用tiktoken，使用简单字符数量估算", self.verbose)
+            return len(text) // 4
         except Exception as e:
             safe_print(f"计算token数量时出错: {e}", self.verbose)
             return len(text) // 4
     
+    def count_tokens_batch(self, texts):
+        """批量计算多段文本的token数量
+        
+        Args:
+            texts: 要计算token数的文本列表
+            
+        Returns:
+            list: 与texts一一对应的token数量
+        """
+        if self.encoding:
+            try:
+                # 一次调用完成整批编码，由tiktoken内部并行处理
+                return [len(tokens) for tokens in self.encoding.encode_ordinary_batch(texts)]
+            except Exception as e:
+                safe_print(f"批量计算token数量时出错: {e}", self.verbose)
+        return [self.count_tokens(text) for text in texts]
+    
     def print_token_statistics(self):
         """打印Token使用统计"""
         try:
@@ -216,6 +268,8 @@ class ApiManager:
             safe_print(f"总输入 tokens: {self.total_input_tokens:,}", True)
             safe_print(f"总输出 tokens: {self.total_output_tokens:,}", True)
             safe_print(f"总计 tokens: {self.total_input_tokens + self.total_output_tokens:,}", True)
+            if self.cache_hits:
+                safe_print(f"缓存命中请求数: {self.cache_hits}", True)
             
             # 计算费用
             input_price = self.config.get('api_price_input', 20.0) / 1000000  # 元/token
@@ -3,9 +3,89 @@
 提供并行处理和批量翻译的功能
 """
 import re
+import statistics
+import itertools
 import concurrent.futures
+from collections import deque
 from tqdm import tqdm
 
+from utils import console_print
+
+# 批量响应解析用的正则表达式，模块加载时编译一次
+# 标题/摘要/关键词翻译字段：只消耗字段标签，内容在前瞻中捕获，
+# 一次扫描即可取出三个字段，且某字段内容为空时不会吞掉后面的标签
+_TRANSLATION_FIELDS_RE = re.compile(
+    r"标题翻译[:：]?(?=\s*(?P<translated_title>.*?)(?:\n|$))"
+    r"|摘要翻译[:：]?(?=\s*(?P<translated_abstract>.*?)(?:\n关键词|$))"
+    r"|关键词翻译[:：]?(?=\s*(?P<translated_keywords>.*?)(?:\n|$))",
+    re.DOTALL)
+_KEYWORDS_PREFIX_RE = re.compile(r'^.*?关键词[:：]\s*')
+_BLOCK_RE = re.compile(r"【(\d+)】(.*?)【/\1】", re.DOTALL)  # 【k】...【/k】 结果块
+
+# 非详细模式下仍需输出的重要消息关键词
+_IMPORTANT_RE = re.compile("成功|完成|错误|失败|警告|初始化")
+
+# 自适应批次大小的目标token数，略低于触发批次分割的4000 tokens
+_TARGET_BATCH_TOKENS = 3500
+
+
+def _split_response_blocks(response):
+    """一次扫描响应文本，提取所有【k】...【/k】结果块
+    
+    Args:
+        response: AI响应文本
+        
+    Returns:
+        dict: 文章序号(从1开始) -> 对应结果块内容，同一序号只保留首次出现的块
+    """
+    blocks = {}
+    for match in _BLOCK_RE.finditer(response):
+        blocks.setdefault(int(match.group(1)), match.group(2))
+    return blocks
+
+
+def _iter_batches(items, batch_size):
+    """按批次大小逐批产出列表，不预先生成全部批次
+    
+    Args:
+        items: 要分批的可迭代对象
+        batch_size: 每个批次的元素数量
+        
+    Yields:
+        list: 一个批次的元素
+    """
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _iter_completed(executor, fn, items, limit):
+    """有界地提交任务，并按完成顺序逐个返回future
+    
+    同一时刻最多只有limit个未完成的future，避免一次性为全部任务创建future。
+    
+    Args:
+        executor: 线程池执行器
+        fn: 处理单个任务的函数
+        items: 任务参数的可迭代对象
+        limit: 同时在执行中的最大任务数
+        
+    Yields:
+        已完成的future
+    """
+    inflight = set()
+    for item in items:
+        if len(inflight) >= limit:
+            done, inflight = concurrent.futures.wait(
+                inflight, return_when=concurrent.futures.FIRST_COMPLETED)
+            yield from done
+        inflight.add(executor.submit(fn, item))
+    yield from concurrent.futures.as_completed(inflight)
+
+
 try:
     from log_utils import get_logger
     
@@ -14,7 +94,7 @@ try:
         logger = get_logger()
         if not verbose:
             # 检查是否为重要消息
-            if not any(key in msg for key in ["成功", "完成", "错误", "失败", "警告", "初始化"]):
+            if not _IMPORTANT_RE.search(msg):
                 return
         logger.log(msg, verbose)
 except ImportError:
@@ -22,17 +102,10 @@ except ImportError:
         """安全打印，处理编码问题"""
         if not verbose:
             # 检查是否为重要消息
-            if not any(key in msg for key in ["成功", "完成", "错误", "失败", "警告", "初始化"]):
+            if not _IMPORTANT_RE.search(msg):
                 return
                 
-        try:
-            print(msg)
-            import sys
-            sys.stdout.flush()
-        except:
-            print(str(msg).encode('utf-8', 'ignore').decode('utf-8', 'ignore'))
-            import sys
-            sys.stdout.flush()
+        console_print(msg)
 
 
 class BatchProcessor:
@@ -47,6 +120,24 @@ class BatchProcessor:
         """
         self.api_manager = api_manager
         self.verbose = verbose
+        self.token_history = deque(maxlen=200)  # 最近处理文章的token数，用于自适应批次大小
+    
+    def _adaptive_batch_size(self, batch_size):
+        """根据最近文章的token数调整批次大小，使每批尽量不触发分割
+        
+        Args:
+            batch_size: 配置的批次大小，作为上限
+            
+        Returns:
+            int: 实际使用的批次大小
+        """
+        if not self.token_history:
+            return batch_size
+        
+        median_tokens = statistics.median(self.token_history)
+        if median_tokens <= 0:
+            return batch_size
+        return max(1, min(batch_size, int(_TARGET_BATCH_TOKENS // median_tokens)))
     
     def process_batches_parallel(self, articles, batch_size, max_workers, process_func):
         """并行处理多个批次
@@ -62,24 +153,23 @@ class BatchProcessor:
         """
         processed_articles = []
         
-        # 将文章分成批次
-        batches = []
-        for i in range(0, len(articles), batch_size):
-            batch = articles[i:i+batch_size]
-            batches.append(batch)
+        # 根据近期文章长度调整批次大小
+        effective_size = self._adaptive_batch_size(batch_size)
+        if effective_size != batch_size:
+            safe_print(f"根据近期文章长度将批次大小从 {batch_size} 调整为 {effective_size}", self.verbose)
+            batch_size = effective_size
         
-        safe_print(f"将 {len(articles)} 篇文章分成 {len(batches)} 个批次处理", True)
+        # 将文章分成批次，批次在提交时才逐个生成
+        batch_count = (len(articles) + batch_size - 1) // batch_size
+        batches = _iter_batches(articles, batch_size)
+        
+        safe_print(f"将 {len(articles)} 篇文章分成 {batch_count} 个批次处理", True)
         
         # 使用线程池并行处理批次
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
-            for batch in batches:
-                future = executor.submit(process_func, batch)
-                futures.append(future)
-            
             # 使用tqdm显示进度条
-            with tqdm(total=len(batches), desc="批量处理", unit="批", gui=False) as pbar: # 明确禁用 GUI 模式
-                for future in concurrent.futures.as_completed(futures):
+            with tqdm(total=batch_count, desc="批量处理", unit="批", gui=False) as pbar: # 明确禁用 GUI 模式
+                for future in _iter_completed(executor, process_func, batches, max_workers * 2):
                     try:
                         batch_result = future.result()
                         processed_articles.extend(batch_result)
@@ -105,14 +195,9 @@ class BatchProcessor:
         
         # 使用线程池并行处理文章
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
-            for article in articles:
-                future = executor.submit(process_func, article)
-                futures.append(future)
-            
             # 使用tqdm显示进度条
             with tqdm(total=len(articles), desc="翻译文献", unit="篇", gui=False) as pbar: # 明确禁用 GUI 模式
-                for future in concurrent.futures.as_completed(futures):
+                for future in _iter_completed(executor, process_func, articles, max_workers * 2):
                     try:
                         result = future.result()
                         processed_articles.append(result)
@@ -132,23 +217,38 @@ class BatchProcessor:
         Returns:
             批量翻译的提示词
         """
-        prompt = "请将以下多篇学术文章的标题、摘要和关键词翻译成中文，保持学术专业性。\n\n"
-        prompt += "格式要求:\n"
-        prompt += "1. 每篇文章的翻译结果放在【文章ID】和【/文章ID】标记之间\n"
-        prompt += "2. 每篇文章的翻译包含三部分：标题翻译、摘要翻译和关键词翻译\n"
-        prompt += "3. 对于标题和摘要，直接翻译即可\n"
-        prompt += "4. 对于关键词，请保持专业性，用分号分隔\n\n"
+        # 整批文章的token数一次性估计，分割批次时直接复用，不再重复计算
+        # 各字段分别编码后相加，避免为每篇文章拼接临时字符串；字段边界处的误差对阈值判断可忽略
+        token_counts = [sum(counts) for counts in zip(
+            api_manager.count_tokens_batch([article.get('title', '') for article in batch]),
+            api_manager.count_tokens_batch([article.get('abstract', '') for article in batch]),
+            api_manager.count_tokens_batch([article.get('keywords', '') for article in batch]),
+        )]
+        self.token_history.extend(token_counts)
+        return self._build_translation_prompt(batch, token_counts)
+    
+    def _build_translation_prompt(self, batch, token_counts):
+        """根据已估计的token数构建批量翻译的提示词
         
-        # 检查批次大小是否过大
-        total_tokens = 0
-        for article in batch:
-            title = article.get('title', '')
-            abstract = article.get('abstract', '')
-            keywords = article.get('keywords', '')
+        Args:
+            batch: 一批文章
+            token_counts: 与batch一一对应的每篇文章token数
             
-            # 估计token数
-            article_tokens = api_manager.count_tokens(title + abstract + keywords)
-            total_tokens += article_tokens
+        Returns:
+            批量翻译的提示词
+        """
+        # 提示词各段先放入列表，最后一次性拼接
+        parts = [
+            "请将以下多篇学术文章的标题、摘要和关键词翻译成中文，保持学术专业性。\n\n"
+            "格式要求:\n"
+            "1. 每篇文章的翻译结果放在【文章ID】和【/文章ID】标记之间\n"
+            "2. 每篇文章的翻译包含三部分：标题翻译、摘要翻译和关键词翻译\n"
+            "3. 对于标题和摘要，直接翻译即可\n"
+            "4. 对于关键词，请保持专业性，用分号分隔\n\n"
+        ]
+        
+        # 检查批次大小是否过大
+        total_tokens = sum(token_counts)
         
         # 如果总tokens超过一定阈值，发出警告并分割批次
         if total_tokens > 4000:
@@ -157,8 +257,8 @@ class BatchProcessor:
             if len(batch) > 1:
                 # 将批次分为两半递归处理
                 mid = len(batch) // 2
-                first_half = self.build_batch_translation_prompt(batch[:mid], api_manager)
-                second_half = self.build_batch_translation_prompt(batch[mid:], api_manager)
+                first_half = self._build_translation_prompt(batch[:mid], token_counts[:mid])
+                second_half = self._build_translation_prompt(batch[mid:], token_counts[mid:])
                 return first_half + "\n\n" + second_half
         
         # 添加文章到提示词
@@ -167,29 +267,29 @@ class BatchProcessor:
             abstract = article.get('abstract', '')
             keywords = article.get('keywords', '')
             
-            prompt += f"文章 【{i+1}】:\n"
+            parts.append(f"文章 【{i+1}】:\n")
             if title:
-                prompt += f"标题: {title}\n"
+                parts.append(f"标题: {title}\n")
             else:
-                prompt += "标题: [无标题]\n"
+                parts.append("标题: [无标题]\n")
                 
             if abstract:
                 # 如果摘要很长，只取前1000个字符
                 if len(abstract) > 1000:
-                    prompt += f"摘要(节选): {abstract[:1000]}...\n"
+                    parts.append(f"摘要(节选): {abstract[:1000]}...\n")
                 else:
-                    prompt += f"摘要: {abstract}\n"
+                    parts.append(f"摘要: {abstract}\n")
             else:
-                prompt += "摘要: [无摘要]\n"
+                parts.append("摘要: [无摘要]\n")
                 
             if keywords:
-                prompt += f"关键词: {keywords}\n"
+                parts.append(f"关键词: {keywords}\n")
             else:
-                prompt += "关键词: [无关键词]\n"
+                parts.append("关键词: [无关键词]\n")
                 
-            prompt += "\n"
+            parts.append("\n")
         
-        return prompt
+        return "".join(parts)
     
     def extract_batch_translations(self, batch, response):
         """从批量翻译响应中提取翻译结果
@@ -202,38 +302,28 @@ class BatchProcessor:
             翻译后的文章列表
         """
         results = []
+        blocks = _split_response_blocks(response)
         
         # 为每篇文章提取翻译结果
         for i, article in enumerate(batch):
             article_copy = article.copy()
             
             # 提取当前文章的翻译
-            pattern = rf"【{i+1}】(.*?)【/{i+1}】"
-            matches = re.findall(pattern, response, re.DOTALL)
+            translation = blocks.get(i + 1)
             
-            if matches:
-                translation = matches[0].strip()
+            if translation is not None:
+                translation = translation.strip()
                 
-                # 提取标题翻译
-                title_match = re.search(r"标题翻译[:：]?\s*(.*?)(?:\n|$)", translation, re.DOTALL)
-                if title_match:
-                    article_copy['translated_title'] = title_match.group(1).strip()
-                else:
-                    article_copy['translated_title'] = ""
+                # 一次扫描提取标题、摘要和关键词翻译，每个字段取首次出现的内容
+                fields = {}
+                for match in _TRANSLATION_FIELDS_RE.finditer(translation):
+                    field = match.lastgroup
+                    if field not in fields:
+                        fields[field] = match.group(field).strip()
                 
-                # 提取摘要翻译
-                abstract_match = re.search(r"摘要翻译[:：]?\s*(.*?)(?:\n关键词|$)", translation, re.DOTALL)
-                if abstract_match:
-                    article_copy['translated_abstract'] = abstract_match.group(1).strip()
-                else:
-                    article_copy['translated_abstract'] = ""
-                
-                # 提取关键词翻译
-                keywords_match = re.search(r"关键词翻译[:：]?\s*(.*?)(?:\n|$)", translation, re.DOTALL)
-                if keywords_match:
-                    article_copy['translated_keywords'] = keywords_match.group(1).strip()
-                else:
-                    article_copy['translated_keywords'] = ""
+                article_copy['translated_title'] = fields.get('translated_title', "")
+                article_copy['translated_abstract'] = fields.get('translated_abstract', "")
+                article_copy['translated_keywords'] = fields.get('translated_keywords', "")
             else:
                 # 如果未找到匹配，保持原始字段
                 article_copy['translated_title'] = ""
@@ -258,28 +348,30 @@ class BatchProcessor:
             return []
             
         # 准备提示词
-        prompt = "请为以下学术文章批量生成专业关键词，每篇文章生成5-8个关键词。\n\n"
-        prompt += "格式要求:\n"
-        prompt += "1. 同时提供英文关键词和中文翻译，格式为 '英文关键词 (中文翻译)'\n"
-        prompt += "2. 每篇文章的关键词之间用分号隔开\n"
-        prompt += "3. 每篇文章的关键词集合放在【文章ID】关键词集合【/文章ID】之间\n\n"
+        parts = [
+            "请为以下学术文章批量生成专业关键词，每篇文章生成5-8个关键词。\n\n"
+            "格式要求:\n"
+            "1. 同时提供英文关键词和中文翻译，格式为 '英文关键词 (中文翻译)'\n"
+            "2. 每篇文章的关键词之间用分号隔开\n"
+            "3. 每篇文章的关键词集合放在【文章ID】关键词集合【/文章ID】之间\n\n"
+        ]
         
         for i, article in enumerate(articles_batch):
-            prompt += f"文章 【{i+1}】:\n"
-            prompt += f"标题: {article.get('title', '无标题')}\n"
+            parts.append(f"文章 【{i+1}】:\n")
+            parts.append(f"标题: {article.get('title', '无标题')}\n")
             
             # 如果摘要太长，截取前500个字符
             abstract = article.get('abstract', '')
             if abstract:
                 if len(abstract) > 500:
-                    prompt += f"摘要(节选): {abstract[:500]}...\n\n"
+                    parts.append(f"摘要(节选): {abstract[:500]}...\n\n")
                 else:
-                    prompt += f"摘要: {abstract}\n\n"
+                    parts.append(f"摘要: {abstract}\n\n")
             else:
-                prompt += "摘要: 无\n\n"
+                parts.append("摘要: 无\n\n")
                 
         # 调用API
-        response = api_manager.call_ai_api(prompt)
+        response = api_manager.call_ai_api("".join(parts))
         
         # 处理返回的关键词
         return self.extract_batch_keywords(articles_batch, response)
@@ -295,19 +387,19 @@ class BatchProcessor:
             添加了关键词的文章批次
         """
         result_articles = []
+        blocks = _split_response_blocks(response)
         
         for i, article in enumerate(articles_batch):
             article_copy = article.copy()
             
             # 提取当前文章的关键词
-            pattern = rf"【{i+1}】(.*?)【/{i+1}】"
-            matches = re.findall(pattern, response, re.DOTALL)
+            keywords_text = blocks.get(i + 1)
             
-            if matches:
+            if keywords_text is not None:
                 # 清理提取的关键词文本
-                keywords_text = matches[0].strip()
+                keywords_text = keywords_text.strip()
                 # 删除可能的"关键词："前缀
-                keywords_text = re.sub(r'^.*?关键词[:：]\s*', '', keywords_text)
+                keywords_text = _KEYWORDS_PREFIX_RE.sub('', keywords_text)
                 # 标记为AI生成
                 ai_keywords = f"[AI生成] {keywords_text}"
                 article_copy['keywords'] = ai_keywords
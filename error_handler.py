@@ -7,48 +7,73 @@ import sys
 import time
 import random
 import json
+import queue
+import atexit
 import traceback
 import threading
+from collections import Counter, defaultdict, deque
 from datetime import datetime
 from functools import wraps
+from itertools import islice
+
+from utils import console_print
+
+# 优先使用fastrlock提供的C实现可重入锁，未安装时退回标准库RLock
+try:
+    from fastrlock.rlock import FastRLock
+except ImportError:
+    FastRLock = threading.RLock
+
+# 错误报告保存目录
+_REPORT_DIR = "error_reports"
+
+# 需要立即输出的严重级别
+_SEVERE = frozenset(("ERROR", "CRITICAL"))
+
+# 失败时尝试写入备份文件的操作类型
+_WRITE_OPS = frozenset(("write", "append"))
 
 # 尝试导入日志工具
 try:
     from log_utils import get_logger, init_logger
     
-    def safe_print(msg, verbose=True):
+    def safe_print(msg, verbose=True, flush=False):
         """使用日志系统输出信息"""
         logger = get_logger()
         logger.log(msg, verbose)
+        if flush:
+            sys.stdout.flush()
 except ImportError:
-    def safe_print(msg, verbose=True):
-        """备用输出方法"""
+    def safe_print(msg, verbose=True, flush=False):
+        """备用输出方法，仅在flush为True时立即刷新stdout"""
         if not verbose:
             return
             
-        try:
-            print(msg)
-            sys.stdout.flush()
-        except:
-            print(str(msg).encode('utf-8', 'ignore').decode('utf-8', 'ignore'))
-            sys.stdout.flush()
+        console_print(msg, flush=flush)
 
 class ErrorTracker:
     """错误跟踪器，记录和分析错误模式"""
     
     _instance = None
-    _lock = threading.RLock()
+    _lock = FastRLock()
     
     def __new__(cls):
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super(ErrorTracker, cls).__new__(cls)
-                cls._instance._errors = []
-                cls._instance._error_counts = {}
-                cls._instance._start_time = datetime.now()
-                cls._instance._last_report_time = datetime.now()
-                cls._instance._report_interval = 300  # 默认每5分钟报告一次
-            return cls._instance
+        # 实例已创建时无需加锁直接返回；仅首次创建时加锁并再次检查
+        instance = cls._instance
+        if instance is None:
+            with cls._lock:
+                instance = cls._instance
+                if instance is None:
+                    instance = super(ErrorTracker, cls).__new__(cls)
+                    instance._errors = deque(maxlen=100)  # 只保留最近100个错误，超出时自动丢弃最旧的记录
+                    instance._error_counts = defaultdict(int)
+                    instance._start_time = datetime.now()
+                    instance._last_report_time = time.monotonic()  # 单调时钟，不受系统时间调整影响
+                    instance._report_interval = 300  # 默认每5分钟报告一次
+                    instance._write_q = None  # 报告文件写入队列，首次保存时创建
+                    instance._ts_cache = (0, "")  # (秒级时间戳, 格式化字符串)，同一秒内复用
+                    cls._instance = instance  # 初始化完成后再发布，避免其他线程拿到未初始化的实例
+        return instance
             
     def track_error(self, error_type, message, source=None, severity="ERROR"):
         """记录一个错误
@@ -57,44 +82,65 @@ class ErrorTracker:
             error_type: 错误类型
             message: 错误信息
             source: 错误来源（模块/函数）
-            severity: 严重程度（INFO, WARNING, ERROR, CRITICAL）
+            severity: 严重程度（INFO, WARNING, ERROR, CRITICAL）；
+                没有活动异常的INFO事件只计数，不生成错误记录
         """
+        exc_type = sys.exc_info()[0]
         with self._lock:
-            timestamp = datetime.now()
+            # 快速路径：无异常的INFO事件只更新计数
+            if severity == "INFO" and exc_type is None:
+                self._error_counts[f"{error_type}:{source}"] += 1
+                return
+            
+            # 同一秒内的错误复用已格式化的时间字符串
+            sec = int(time.time())
+            if sec == self._ts_cache[0]:
+                timestamp = self._ts_cache[1]
+            else:
+                timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+                self._ts_cache = (sec, timestamp)
+            
+            # 仅在存在活动异常时才格式化堆栈，避免无谓的字符串构建
+            tb = traceback.format_exc() if exc_type else None
             
             # 创建错误记录
             error_record = {
-                "timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                "timestamp": timestamp,
                 "type": error_type,
                 "message": message,
                 "source": source or "unknown",
                 "severity": severity,
-                "traceback": traceback.format_exc() if sys.exc_info()[0] else None
+                "traceback": tb
             }
             
             # 添加到错误列表
             self._errors.append(error_record)
             
             # 更新错误计数
-            error_key = f"{error_type}:{source}"
-            if error_key in self._error_counts:
-                self._error_counts[error_key] += 1
-            else:
-                self._error_counts[error_key] = 1
+            self._error_counts[f"{error_type}:{source}"] += 1
             
-            # 如果是严重错误，立即记录日志
-            if severity in ["ERROR", "CRITICAL"]:
-                safe_print(f"{severity}: {error_type} in {source}: {message}", True)
+            # 如果是严重错误，立即记录日志并刷新输出
+            if severity in _SEVERE:
+                safe_print(f"{severity}: {error_type} in {source}: {message}", True, flush=True)
                 
-            # 检查是否需要生成报告
-            self._check_report_time()
+            # 检查是否需要生成报告（锁内只做判断）
+            report_due = self._check_report_time()
+        
+        # 在锁外生成报告，避免阻塞其他线程记录错误
+        if report_due:
+            self.generate_report()
     
     def _check_report_time(self):
-        """检查是否需要生成错误报告"""
-        now = datetime.now()
-        if (now - self._last_report_time).total_seconds() > self._report_interval:
-            self.generate_report()
+        """检查是否需要生成错误报告，需在持有锁时调用
+        
+        Returns:
+            bool: 是否到了生成报告的时间；为True时已更新上次报告时间
+        """
+        now = time.monotonic()
+        if now - self._last_report_time > self._report_interval:
             self._last_report_time = now
+            return True
+        return False
     
     def generate_report(self, save_to_file=False):
         """生成错误报告
@@ -102,78 +148,87 @@ class ErrorTracker:
         Args:
             save_to_file: 是否保存到文件
         """
+        # 只在锁内复制错误记录快照，报告的构建与输出在锁外完成
         with self._lock:
             if not self._errors:
                 return
-                
-            # 错误摘要
-            total_errors = len(self._errors)
-            runtime = (datetime.now() - self._start_time).total_seconds() / 60.0
-            
-            report = [
-                "=" * 60,
-                f"错误报告 - 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                f"总运行时间: {runtime:.1f} 分钟",
-                f"总错误数: {total_errors}",
-                "=" * 60
-            ]
-            
-            # 按错误类型分组
-            error_types = {}
-            for error in self._errors:
-                error_type = error["type"]
-                if error_type in error_types:
-                    error_types[error_type].append(error)
-                else:
-                    error_types[error_type] = [error]
-            
-            # 添加错误类型摘要
-            report.append("\n错误类型摘要:")
-            for error_type, errors in error_types.items():
-                report.append(f"- {error_type}: {len(errors)} 次错误")
+            errors = list(self._errors)
+        
+        # 错误摘要
+        total_errors = len(errors)
+        runtime = (datetime.now() - self._start_time).total_seconds() / 60.0
+        
+        report = [
+            "=" * 60,
+            f"错误报告 - 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"总运行时间: {runtime:.1f} 分钟",
+            f"总错误数: {total_errors}",
+            "=" * 60
+        ]
+        
+        # 按错误类型计数
+        error_types = Counter(error["type"] for error in errors)
+        
+        # 添加错误类型摘要
+        report.append("\n错误类型摘要:")
+        for error_type, count in error_types.items():
+            report.append(f"- {error_type}: {count} 次错误")
+        
+        # 添加最近的5个错误的详细信息
+        report.append("\n最近错误详情 (最多5个):")
+        for i, error in enumerate(errors[-5:]):
+            report.append(f"\n{i+1}. [{error['severity']}] {error['type']} - {error['timestamp']}")
+            report.append(f"   来源: {error['source']}")
+            report.append(f"   消息: {error['message']}")
             
-            # 添加最近的5个错误的详细信息
-            report.append("\n最近错误详情 (最多5个):")
-            for i, error in enumerate(self._errors[-5:]):
-                report.append(f"\n{i+1}. [{error['severity']}] {error['type']} - {error['timestamp']}")
-                report.append(f"   来源: {error['source']}")
-                report.append(f"   消息: {error['message']}")
+            if error.get("traceback"):
+                tb_lines = error["traceback"].splitlines()
+                tb_summary = "\n      ".join(islice(tb_lines, 5))
+                if len(tb_lines) > 5:
+                    tb_summary += "\n      ..."
+                report.append(f"   堆栈: {tb_summary}")
+        
+        report_text = "\n".join(report)
+        safe_print(report_text, True)
+        
+        # 如果需要，交给后台线程保存到文件，避免持锁等待磁盘I/O
+        if save_to_file:
+            filename = os.path.join(_REPORT_DIR, f"error_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+            self._get_write_queue().put((filename, report_text))
+    
+    def _get_write_queue(self):
+        """获取报告写入队列，首次调用时启动后台写入线程
+        
+        Returns:
+            queue.Queue: 报告写入队列
+        """
+        with self._lock:
+            if self._write_q is None:
+                self._write_q = queue.Queue()
+                threading.Thread(target=self._writer_loop, name="ErrorReportWriter", daemon=True).start()
+                # 程序退出前等待队列中的报告全部写完
+                atexit.register(self._write_q.join)
+            return self._write_q
+    
+    def _writer_loop(self):
+        """后台写入线程：依次将队列中的报告写入文件"""
+        while True:
+            filename, report_text = self._write_q.get()
+            try:
+                # 创建错误报告目录
+                os.makedirs(_REPORT_DIR, exist_ok=True)
                 
-                if error.get("traceback"):
-                    tb_lines = error["traceback"].split("\n")
-                    if len(tb_lines) > 5:
-                        tb_summary = "\n      ".join(tb_lines[:5]) + "\n      ..."
-                    else:
-                        tb_summary = "\n      ".join(tb_lines)
-                    report.append(f"   堆栈: {tb_summary}")
-            
-            report_text = "\n".join(report)
-            safe_print(report_text, True)
-            
-            # 如果需要，保存到文件
-            if save_to_file:
-                try:
-                    # 创建错误报告目录
-                    report_dir = "error_reports"
-                    if not os.path.exists(report_dir):
-                        os.makedirs(report_dir)
-                        
-                    # 生成文件名
-                    filename = f"{report_dir}/error_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-                    
-                    # 写入文件
-                    with open(filename, "w", encoding="utf-8") as f:
-                        f.write(report_text)
-                    
-                    safe_print(f"错误报告已保存到: {filename}", True)
-                except Exception as e:
-                    safe_print(f"保存错误报告失败: {e}", True)
-            
-            # 清除旧错误记录，只保留最近100个
-            if len(self._errors) > 100:
-                self._errors = self._errors[-100:]
+                # 一次性编码后以二进制写入，跳过文本I/O层的逐块编码
+                with open(filename, "wb") as f:
+                    f.write(report_text.encode("utf-8"))
+                
+                safe_print(f"错误报告已保存到: {filename}", True)
+            except Exception as e:
+                safe_print(f"保存错误报告失败: {e}", True, flush=True)
+            finally:
+                self._write_q.task_done()
 
-def retry(max_attempts=3, delay=1, backoff=2, exceptions=(Exception,)):
+def retry(max_attempts=3, delay=1, backoff=2, exceptions=(Exception,), jitter="additive", cap=60):
     """重试装饰器
     
     Args:
@@ -181,12 +236,27 @@ def retry(max_attempts=3, delay=1, backoff=2, exceptions=(Exception,)):
         delay: 初始延迟时间(秒)
         backoff: 退避因子
         exceptions: 要捕获和重试的异常类型
+        jitter: 抖动策略
+            - "additive": 指数退避后加上[0,1)秒随机抖动（默认）
+            - "full": 在[0, 指数退避时间]内均匀取值
+            - "decorrelated": 在[delay, 上次等待时间*3]内均匀取值
+            - "none": 不加抖动
+        cap: 单次等待时间上限(秒)
     """
+    if jitter not in ("additive", "full", "decorrelated", "none"):
+        raise ValueError(f"不支持的抖动策略: {jitter}")
+    
     def decorator(func):
+        # 不需要重试时直接返回原函数，省去包装开销
+        if max_attempts <= 1 or not exceptions:
+            return func
+        
+        tracker = ErrorTracker()  # 单例，装饰时获取一次即可
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            tracker = ErrorTracker()
             attempts = 0
+            prev_sleep = delay
             while attempts < max_attempts:
                 try:
                     return func(*args, **kwargs)
@@ -202,7 +272,15 @@ def retry(max_attempts=3, delay=1, backoff=2, exceptions=(Exception,)):
                         raise
                     
                     # 计算延迟时间（指数退避 + 抖动）
-                    wait_time = delay * (backoff ** (attempts - 1)) + (random.random())
+                    if jitter == "decorrelated":
+                        wait_time = min(cap, random.uniform(delay, prev_sleep * 3))
+                    elif jitter == "full":
+                        wait_time = random.uniform(0, min(cap, delay * (backoff ** (attempts - 1))))
+                    elif jitter == "none":
+                        wait_time = min(cap, delay * (backoff ** (attempts - 1)))
+                    else:
+                        wait_time = min(cap, delay * (backoff ** (attempts - 1)) + random.random())
+                    prev_sleep = wait_time
                     
                     # 记录重试情况
                     tracker.track_error(
@@ -223,9 +301,10 @@ def safe_file_operation(operation_type="write"):
         operation_type: 操作类型 ("read", "write", "append")
     """
     def decorator(func):
+        tracker = ErrorTracker()  # 单例，装饰时获取一次即可
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            tracker = ErrorTracker()
             try:
                 return func(*args, **kwargs)
             except (IOError, OSError, PermissionError) as e:
@@ -240,7 +319,7 @@ def safe_file_operation(operation_type="write"):
                 )
                 
                 # 尝试提供替代路径
-                if operation_type in ("write", "append"):
+                if operation_type in _WRITE_OPS:
                     try:
                         backup_path = f"{os.path.basename(file_path)}.backup"
                         safe_print(f"尝试写入备份文件: {backup_path}", True)
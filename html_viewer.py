@@ -6,7 +6,10 @@ import sys
 
 try:
     from error_handler import safe_print, ErrorTracker
+    _HAS_TRACKER = True
 except ImportError:
+    _HAS_TRACKER = False
+    
     def safe_print(msg, verbose=True):
         if verbose:
             print(msg)
@@ -51,16 +54,14 @@ def main():
             return 1
     except Exception as e:
         safe_print(f"处理错误: {e}", True)
-        try:
-            from error_handler import ErrorTracker
-            ErrorTracker().track_error(
+        if _HAS_TRACKER:
+            tracker = ErrorTracker()
+            tracker.track_error(
                 "ViewerGenerationError",
                 f"生成HTML浏览器时发生错误: {str(e)}",
                 source="main"
             )
-            ErrorTracker().generate_report(save_to_file=True)
-        except ImportError:
-            pass
+            tracker.generate_report(save_to_file=True)
         return 1
 
 if __name__ == "__main__":
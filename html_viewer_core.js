@@ -6,6 +6,8 @@
 console.log("Script start");
 let articles = [];
 let chartData = {};
+// 文章总数（HTML中可能只内嵌了首页数据）
+let totalArticles = 0;
 // 声明为全局变量，方便各函数访问
 let fields = [];
 // 添加默认字段配置
@@ -105,24 +107,31 @@ function renderColumnSelector() {
     }
 }
 
+// 时间类字段统一显示为“时间”
+const TIME_FIELDS = new Set(['publish_time','pub_time','publication_date','date','time','datetime','created_at','updated_at']);
+
+// 字段名到中文显示名称的映射
+const FIELD_LABELS = {
+    'title': '标题',
+    'translated_title': '翻译标题',
+    'authors': '作者',
+    'journal': '期刊',
+    'year': '年份',
+    'pmid': 'PMID',
+    'doi': 'DOI',
+    'url': '链接',
+    'abstract': '摘要',
+    'translated_abstract': '翻译摘要',
+    'keywords': '关键词',
+    'translated_keywords': '翻译关键词',
+    'quartile': '分区',
+    'impact_factor': '影响因子'
+};
+
 // 添加获取显示名称的辅助函数
 function getDisplayName(field) {
-    if (['publish_time','pub_time','publication_date','date','time','datetime','created_at','updated_at'].includes(field)) return '时间';
-    else if (field === 'title') return '标题';
-    else if (field === 'translated_title') return '翻译标题';
-    else if (field === 'authors') return '作者';
-    else if (field === 'journal') return '期刊';
-    else if (field === 'year') return '年份';
-    else if (field === 'pmid') return 'PMID';
-    else if (field === 'doi') return 'DOI';
-    else if (field === 'url') return '链接';
-    else if (field === 'abstract') return '摘要';
-    else if (field === 'translated_abstract') return '翻译摘要';
-    else if (field === 'keywords') return '关键词';
-    else if (field === 'translated_keywords') return '翻译关键词';
-    else if (field === 'quartile') return '分区';
-    else if (field === 'impact_factor') return '影响因子';
-    return field;
+    if (TIME_FIELDS.has(field)) return '时间';
+    return Object.prototype.hasOwnProperty.call(FIELD_LABELS, field) ? FIELD_LABELS[field] : field;
 }
 
 function renderInitialHeader(allFields) {
@@ -144,6 +153,22 @@ function renderInitialHeader(allFields) {
     console.log("Initial header rendered.");
 }
 
+// 生成单元格HTML，pmid/doi/url字段转换为链接
+function formatCell(field, val) {
+    if (val === undefined || val === null) return '';
+    const key = field.toLowerCase();
+    if (key === 'pmid' && val) {
+        return `<a href="https://pubmed.ncbi.nlm.nih.gov/${val}" target="_blank">${val}</a>`;
+    }
+    if (key === 'doi' && val) {
+        return `<a href="https://doi.org/${val}" target="_blank">${val}</a>`;
+    }
+    if (key === 'url' && val) {
+        return `<a href="${val}" target="_blank">链接</a>`;
+    }
+    return val;
+}
+
 function renderInitialTable(data, allFields) {
     console.log("Rendering initial table body...");
     const tableBody = document.getElementById('tableBody');
@@ -159,26 +184,12 @@ function renderInitialTable(data, allFields) {
         return;
     }
 
-    data.forEach(row => {
-        const tr = document.createElement('tr');
-        allFields.forEach(field => {
-            let val = (row && typeof row === 'object' && row[field] !== undefined) ? row[field] : '';
-            if (field.toLowerCase() === 'pmid' && val) {
-                val = `<a href="https://pubmed.ncbi.nlm.nih.gov/${val}" target="_blank">${val}</a>`;
-            }
-            if (field.toLowerCase() === 'doi' && val) {
-                val = `<a href="https://doi.org/${val}" target="_blank">${val}</a>`;
-            }
-            if (field.toLowerCase() === 'url' && val) {
-                val = `<a href="${val}" target="_blank">链接</a>`;
-            }
-            const td = document.createElement('td');
-            td.innerHTML = val;
-            tr.appendChild(td);
-        });
-        tableBody.appendChild(tr);
-    });
-    if(articleCountElement) articleCountElement.textContent = data.length;
+    // 先拼接整个表体的HTML，再一次性写入DOM，避免逐个节点插入
+    tableBody.innerHTML = data.map(row => {
+        const isObject = row && typeof row === 'object';
+        return '<tr>' + allFields.map(field => `<td>${formatCell(field, isObject ? row[field] : undefined)}</td>`).join('') + '</tr>';
+    }).join('');
+    if(articleCountElement) articleCountElement.textContent = Math.max(totalArticles, data.length);
     console.log(`Initial table body rendered with ${data.length} rows.`);
 }
 
@@ -186,6 +197,7 @@ function initializeDataFromJson() {
     try {
         // 实际的数据会在Python生成HTML时注入
         articles = ARTICLES_DATA || [];
+        totalArticles = (typeof ARTICLES_TOTAL === 'number') ? ARTICLES_TOTAL : articles.length;
         chartData = CHART_DATA || {};
         // 获取默认列设置
         defaultVisibleColumns = DEFAULT_VISIBLE_COLUMNS || null;
@@ -219,6 +231,30 @@ function initializeDataFromJson() {
     return fields;
 }
 
+// 首页之外的文章数据放在单独的脚本文件中，表格初始化后再加载并替换表格数据
+function loadRemainingArticles(dataTable) {
+    if (typeof ARTICLES_DATA_FILE === 'undefined' || !ARTICLES_DATA_FILE || !dataTable) return;
+    const script = document.createElement('script');
+    script.src = ARTICLES_DATA_FILE;
+    script.onload = function() {
+        if (typeof ARTICLES_DATA_FULL === 'undefined' || !Array.isArray(ARTICLES_DATA_FULL)) {
+            console.warn(`Full article data not found in ${ARTICLES_DATA_FILE}.`);
+            return;
+        }
+        articles = ARTICLES_DATA_FULL;
+        const rows = articles.map(row => {
+            const isObject = row && typeof row === 'object';
+            return fields.map(field => String(formatCell(field, isObject ? row[field] : undefined)));
+        });
+        dataTable.clear().rows.add(rows).draw(false);
+        console.log(`Loaded all ${articles.length} articles from ${ARTICLES_DATA_FILE}.`);
+    };
+    script.onerror = function() {
+        console.error(`无法加载完整文章数据: ${ARTICLES_DATA_FILE}，仅显示首页数据`);
+    };
+    document.body.appendChild(script);
+}
+
 function initializeDataTable(fields) {
     let dataTable = null;
     
@@ -342,6 +378,9 @@ function initializeDataTable(fields) {
                         searchFieldSelect.value = defaultSearchField;
                     }
                 }
+                
+                // 首页渲染完成后再加载其余文章
+                loadRemainingArticles(dataTable);
             } else {
                 console.warn("DataTable initialization skipped: Table body is empty or contains 'no data' row.");
                  $('.dt-buttons, .dataTables_filter, .dataTables_info, .dataTables_paginate').hide();
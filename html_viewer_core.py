@@ -2,9 +2,12 @@
 HTML文献浏览器核心功能模块
 """
 import os
+import re
 import csv
 import json
+import functools
 from collections import Counter, defaultdict
+from itertools import chain
 
 try:
     from error_handler import safe_print, safe_file_operation
@@ -17,6 +20,138 @@ except ImportError:
             return func
         return decorator
 
+# 优先使用orjson（C实现，直接输出UTF-8字节），未安装时使用标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 读写CSV/HTML等大文件时使用的缓冲区大小，减少读写系统调用次数
+_IO_BUFFER_SIZE = 1024 * 1024
+
+# 处理后文章的固定字段（按输出顺序），CSV中缺失时以空字符串补齐
+_ARTICLE_FIELDS = (
+    'id', 'title', 'authors', 'journal', 'year', 'pmid', 'doi', 'abstract', 'keywords',
+    'translated_title', 'translated_abstract', 'translated_keywords',
+    'quartile', 'impact_factor', 'url'
+)
+
+# 没有pub_date时依次尝试的时间字段
+_POSSIBLE_TIME_FIELDS = ('publish_time', 'pub_time', 'publication_date', 'date', 'time', 'datetime', 'created_at', 'updated_at')
+
+# 从日期/时间字段中提取年份
+_YEAR_RE = re.compile(r'\d{4}')
+
+# 配置文件键名到生成器配置键名的映射
+_CONFIG_KEY_MAPPING = {
+    'output_llm': 'input_html',
+    'html_page_title': 'page_title',
+    'html_show_english': 'show_english',
+    'html_dark_mode': 'dark_mode',
+    'html_highlight_keywords': 'highlight_keywords',
+    'viz_wordcloud_max': 'max_keyword_cloud',
+    'html_articles_per_page': 'articles_per_page',
+    'html_enable_charts': 'enable_charts',
+    'html_show_statistics': 'show_statistics',
+    'html_default_columns': 'default_visible_columns',  # 新增映射
+    'html_search_field': 'default_search_field'         # 新增映射
+}
+_INT_CONFIG_KEYS = ['max_keyword_cloud', 'articles_per_page']
+_BOOL_CONFIG_KEYS = ['show_english', 'dark_mode', 'highlight_keywords', 'enable_charts', 'show_statistics']
+
+@functools.lru_cache(maxsize=8)
+def _parse_config_file(config_file, mtime_ns, size):
+    """解析配置文件，结果按(路径, 修改时间, 文件大小)缓存，文件未变化时不再重复读取
+    
+    只做解析，不输出日志也不创建目录，这些副作用由调用方在每次读取配置时执行。
+    
+    Args:
+        config_file: 配置文件路径
+        mtime_ns: 配置文件修改时间(纳秒)，仅作为缓存键
+        size: 配置文件大小，仅作为缓存键
+        
+    Returns:
+        tuple: (覆盖默认值的配置项字典, 无效的整数配置项((键名, 值), ...))
+    """
+    overrides = {}
+    invalid_entries = []
+    with open(config_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                parts = line.split('=', 1)
+                if len(parts) == 2:
+                    key = parts[0].strip()
+                    value = parts[1].strip().split('#', 1)[0].strip()
+                    config_key = _CONFIG_KEY_MAPPING.get(key, key)
+                    if config_key in _BOOL_CONFIG_KEYS:
+                        if value and isinstance(value, str):
+                            overrides[config_key] = value.lower() in ['yes', 'true', 'y', '1']
+                    elif config_key in _INT_CONFIG_KEYS:
+                        try:
+                            if value:
+                                overrides[config_key] = int(value)
+                        except ValueError:
+                            invalid_entries.append((key, value))
+                    else:
+                        overrides[config_key] = value
+                    if key == 'viz_output_dir':
+                        overrides['output_html'] = os.path.join(value, 'literature_viewer.html')
+    return overrides, tuple(invalid_entries)
+
+def _json_dumps(obj):
+    """序列化为不转义非ASCII字符的JSON字符串
+    
+    Args:
+        obj: 要序列化的对象
+        
+    Returns:
+        str: JSON字符串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False)
+
+def _write_json_between(file_path, head, obj, tail):
+    """依次写入head、obj的JSON和tail，JSON直接写入文件，不构建完整的中间字符串
+    
+    Args:
+        file_path: 输出文件路径
+        head: JSON之前的文本
+        obj: 要序列化的对象
+        tail: JSON之后的文本
+    """
+    # orjson直接生成UTF-8字节写入；否则用json.dump流式写入
+    if orjson is not None:
+        with open(file_path, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+            f.write(head.encode('utf-8'))
+            f.write(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS))
+            f.write(tail.encode('utf-8'))
+    else:
+        with open(file_path, 'w', encoding='utf-8', buffering=_IO_BUFFER_SIZE) as f:
+            f.write(head)
+            json.dump(obj, f, ensure_ascii=False, separators=(',', ':'))
+            f.write(tail)
+
+def _read_csv_records(file_path):
+    """用标准库csv模块读取CSV文件为字典列表
+    
+    Args:
+        file_path: CSV文件路径
+        
+    Returns:
+        list: 每行一个字典，键为表头列名；与pandas一致，较短的行以空字符串补齐缺失的列
+    """
+    # 用csv.reader读取表头后直接以dict(zip())构建每行，比DictReader逐行的Python层处理更快
+    with open(file_path, 'r', encoding='utf-8-sig', buffering=_IO_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return []
+        n_fields = len(header)
+        return [dict(zip(header, row if len(row) >= n_fields else row + [''] * (n_fields - len(row))))
+                for row in reader if row]
+
 class HTMLViewerGenerator:
     """HTML文献浏览器生成器"""
 
@@ -49,47 +184,16 @@ class HTMLViewerGenerator:
             'default_visible_columns': '',  # 新增：默认显示的列，逗号分隔
             'default_search_field': '',     # 新增：默认搜索字段
         }
-        key_mapping = {
-            'output_llm': 'input_html',
-            'html_page_title': 'page_title',
-            'html_show_english': 'show_english',
-            'html_dark_mode': 'dark_mode',
-            'html_highlight_keywords': 'highlight_keywords',
-            'viz_wordcloud_max': 'max_keyword_cloud',
-            'html_articles_per_page': 'articles_per_page',
-            'html_enable_charts': 'enable_charts',
-            'html_show_statistics': 'show_statistics',
-            'html_default_columns': 'default_visible_columns',  # 新增映射
-            'html_search_field': 'default_search_field'         # 新增映射
-        }
-        int_config_keys = ['max_keyword_cloud', 'articles_per_page']
-        bool_config_keys = ['show_english', 'dark_mode', 'highlight_keywords', 'enable_charts', 'show_statistics']
         try:
             if os.path.exists(config_file):
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            parts = line.split('=', 1)
-                            if len(parts) == 2:
-                                key = parts[0].strip()
-                                value = parts[1].strip().split('#', 1)[0].strip()
-                                config_key = key_mapping.get(key, key)
-                                if config_key in bool_config_keys:
-                                    if value and isinstance(value, str):
-                                        config[config_key] = value.lower() in ['yes', 'true', 'y', '1']
-                                elif config_key in int_config_keys:
-                                    try:
-                                        if value:
-                                            config[config_key] = int(value)
-                                    except ValueError:
-                                        safe_print(f"警告: 无效的整数配置项 {key}={value}，使用默认值", self.verbose)
-                                else:
-                                    config[config_key] = value
-                                if key == 'viz_output_dir':
-                                    base_dir = value
-                                    os.makedirs(base_dir, exist_ok=True)
-                                    config['output_html'] = os.path.join(base_dir, 'literature_viewer.html')
+                stat = os.stat(config_file)
+                overrides, invalid_entries = _parse_config_file(config_file, stat.st_mtime_ns, stat.st_size)
+                for key, value in invalid_entries:
+                    safe_print(f"警告: 无效的整数配置项 {key}={value}，使用默认值", self.verbose)
+                if 'viz_output_dir' in overrides:
+                    os.makedirs(overrides['viz_output_dir'], exist_ok=True)
+                # 缓存的是覆盖项，合并进新建的默认配置，调用方修改config不会污染缓存
+                config.update(overrides)
                 safe_print(f"已从 {config_file} 加载HTML生成器配置", self.verbose)
             else:
                 safe_print(f"警告: 配置文件 {config_file} 不存在，使用默认设置", True)
@@ -104,9 +208,18 @@ class HTMLViewerGenerator:
             safe_print(f"错误: 输入文件不存在: {file_path}", True)
             return []
         try:
-            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                articles = list(reader)
+            # 优先使用pandas的C解析器；未安装、安装损坏或解析失败时退回csv模块
+            articles = None
+            try:
+                import pandas as pd
+                df = pd.read_csv(file_path, encoding='utf-8-sig', dtype=str, keep_default_na=False, na_filter=False)
+                articles = df.to_dict(orient='records')
+            except ImportError:
+                pass
+            except Exception as e:
+                safe_print(f"警告: pandas读取CSV失败，改用csv模块读取: {e}", self.verbose)
+            if articles is None:
+                articles = _read_csv_records(file_path)
             safe_print(f"已从 {file_path} 读取 {len(articles)} 篇文章", True)
             return articles
         except Exception as e:
@@ -116,39 +229,27 @@ class HTMLViewerGenerator:
     def preprocess_data(self, articles):
         processed_articles = []
         journals_data = defaultdict(list)
-        years_data = defaultdict(int)
-        time_data = defaultdict(int)
-        all_keywords = []
+        year_hits = []       # 各文章的年份，循环结束后统一计数
+        time_hits = []       # 各文章的图表时间键，循环结束后统一计数
+        author_fields = []   # 各文章的作者字段，循环结束后统一统计
+        keyword_fields = []  # 各文章的翻译关键词字段，循环结束后统一统计
         self.stats['journals'] = set()
-        self.stats['years'] = set()
         time_field_found = None
 
+        # 所有行的列相同（读取时已按表头补齐），列名只需从第一行读取一次
         has_pub_date_column = False
+        present_time_fields = ()  # CSV中实际存在的候选时间字段，通常为空
         if articles:
             has_pub_date_column = 'pub_date' in articles[0]
+            present_time_fields = tuple(field for field in _POSSIBLE_TIME_FIELDS if field in articles[0])
 
         for i, article in enumerate(articles):
             try:
-                processed_article = {
-                    'id': i + 1,
-                    'title': article.get('title', ''),
-                    'authors': article.get('authors', ''),
-                    'journal': article.get('journal', ''),
-                    'year': article.get('year', ''), # 初始年份
-                    'pmid': article.get('pmid', ''),
-                    'doi': article.get('doi', ''),
-                    'abstract': article.get('abstract', ''),
-                    'keywords': article.get('keywords', ''),
-                    'translated_title': article.get('translated_title', ''),
-                    'translated_abstract': article.get('translated_abstract', ''),
-                    'translated_keywords': article.get('translated_keywords', ''),
-                    'quartile': article.get('quartile', ''),
-                    'impact_factor': article.get('impact_factor', ''),
-                    'url': f"https://pubmed.ncbi.nlm.nih.gov/{article.get('pmid', '')}"
-                }
-                for key, value in article.items():
-                    if key not in processed_article:
-                        processed_article[key] = value
+                # 固定字段在前且保持顺序，CSV中的其余列按原顺序追加，一次update完成合并
+                processed_article = dict.fromkeys(_ARTICLE_FIELDS, '')
+                processed_article.update(article)
+                processed_article['id'] = i + 1
+                processed_article['url'] = f"https://pubmed.ncbi.nlm.nih.gov/{article.get('pmid', '')}"
 
                 time_value_for_chart = None
                 extracted_year = None
@@ -158,21 +259,18 @@ class HTMLViewerGenerator:
                 if pub_date_val:
                     time_source_field = 'pub_date'
                     time_value_for_chart = pub_date_val
-                    try:
-                        year_str = ''.join(filter(str.isdigit, pub_date_val))[:4]
-                        if len(year_str) == 4: extracted_year = int(year_str)
-                    except: pass
+                    year_match = _YEAR_RE.search(pub_date_val) if isinstance(pub_date_val, str) else None
+                    if year_match:
+                        extracted_year = int(year_match.group())
                 else:
-                    possible_time_fields = ['publish_time', 'pub_time', 'publication_date', 'date', 'time', 'datetime', 'created_at', 'updated_at']
-                    for field in possible_time_fields:
+                    for field in present_time_fields:
                         time_val = processed_article.get(field)
                         if time_val:
                             time_source_field = field
                             time_value_for_chart = time_val
-                            try:
-                                year_str = ''.join(filter(str.isdigit, time_val))[:4]
-                                if len(year_str) == 4: extracted_year = int(year_str)
-                            except: pass
+                            year_match = _YEAR_RE.search(time_val) if isinstance(time_val, str) else None
+                            if year_match:
+                                extracted_year = int(year_match.group())
                             break
 
                 if extracted_year:
@@ -180,20 +278,15 @@ class HTMLViewerGenerator:
 
                 if time_value_for_chart:
                     time_field_found = time_source_field
-                    try:
-                        chart_time_key = time_value_for_chart.split(' ')[0]
-                        time_data[chart_time_key] += 1
-                    except:
-                        time_data[str(time_value_for_chart)] += 1
+                    if isinstance(time_value_for_chart, str):
+                        time_hits.append(time_value_for_chart.split(' ')[0])
+                    else:
+                        time_hits.append(str(time_value_for_chart))
 
-                current_year_for_stats = None
                 year_val_str = processed_article.get('year')
                 if year_val_str:
                     try:
-                        year_int = int(year_val_str)
-                        current_year_for_stats = str(year_int)
-                        self.stats['years'].add(current_year_for_stats)
-                        years_data[current_year_for_stats] += 1
+                        year_hits.append(str(int(year_val_str)))
                     except (ValueError, TypeError):
                         pass
 
@@ -212,21 +305,23 @@ class HTMLViewerGenerator:
                         'quartile': processed_article['quartile']
                     })
                 if processed_article['authors']:
-                    authors = processed_article['authors'].split(', ')
-                    for author in authors:
-                        if author:
-                            self.stats['authors'][author] += 1
+                    author_fields.append(processed_article['authors'])
                 if processed_article['translated_keywords']:
-                    keywords = [k.strip() for k in processed_article['translated_keywords'].split(';')]
-                    all_keywords.extend(keywords)
-                    for keyword in keywords:
-                        if keyword:
-                            self.stats['keywords'][keyword] += 1
+                    keyword_fields.append(processed_article['translated_keywords'])
 
                 processed_articles.append(processed_article)
             except Exception as e:
                 safe_print(f"警告: 处理第{i+1}条数据时出错: {e}", self.verbose)
 
+        # 年份、时间、作者、关键词均在循环结束后一次性计数，由Counter在C层完成累加
+        years_data = Counter(year_hits)
+        time_data = Counter(time_hits)
+        self.stats['years'] = set(years_data)
+        authors = chain.from_iterable(field.split(', ') for field in author_fields)
+        self.stats['authors'].update(author for author in authors if author)
+        keywords = (k.strip() for k in chain.from_iterable(field.split(';') for field in keyword_fields))
+        self.stats['keywords'].update(keyword for keyword in keywords if keyword)
+
         self.stats['total_articles'] = len(processed_articles)
         self.stats['journals'] = list(self.stats['journals'])
         self.stats['years'] = sorted(list(self.stats['years']), reverse=True)
@@ -238,10 +333,12 @@ class HTMLViewerGenerator:
             'journals': {journal: len(data) for journal, data in journals_data.items() if len(data) > 1},
             'keywords': {k: v for k, v in self.stats['keywords'].most_common(self.config['max_keyword_cloud'])}
         }
-        safe_print(f"DEBUG: Preprocessed articles count: {len(processed_articles)}", self.verbose)
-        safe_print(f"DEBUG: Chart data generated: {json.dumps(chart_data, indent=2, ensure_ascii=False)}", self.verbose)
-        if not processed_articles and self.verbose:
-             safe_print("DEBUG: No articles were processed. Check input file and preprocessing logic.", True)
+        # 调试信息仅在详细模式下构建，避免无谓的JSON序列化
+        if self.verbose:
+            safe_print(f"DEBUG: Preprocessed articles count: {len(processed_articles)}", True)
+            safe_print(f"DEBUG: Chart data generated: {json.dumps(chart_data, indent=2, ensure_ascii=False)}", True)
+            if not processed_articles:
+                safe_print("DEBUG: No articles were processed. Check input file and preprocessing logic.", True)
 
         return processed_articles, chart_data
 
@@ -251,12 +348,23 @@ class HTMLViewerGenerator:
             # 确保输出目录存在
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
             
-            # 将文章和图表数据转换为JSON
-            articles_json = json.dumps(articles, ensure_ascii=False)
-            chart_data_json = json.dumps(chart_data, ensure_ascii=False)
+            # 将图表数据转换为JSON；文章数据较大，写文件时直接流式输出
+            chart_data_json = _json_dumps(chart_data)
+            
+            # 文章数超过一页时，HTML中只内嵌首页数据，完整数据写入同目录下的脚本文件，页面渲染首页后再加载
+            per_page = self.config.get('articles_per_page') or 0
+            if 0 < per_page < len(articles):
+                initial_articles = articles[:per_page]
+                data_filename = os.path.splitext(os.path.basename(output_file))[0] + "_data.js"
+                data_filepath = os.path.join(os.path.dirname(output_file), data_filename)
+                _write_json_between(data_filepath, "var ARTICLES_DATA_FULL = ", articles, ";\n")
+                safe_print(f"已生成完整文章数据文件: {data_filepath}", self.verbose)
+            else:
+                initial_articles = articles
+                data_filename = None
             
-            # 生成HTML内容
-            html_content = self._generate_html_template(articles_json, chart_data_json)
+            # 生成HTML模板（文章数据插入点前后两部分）
+            html_head, html_tail = self._generate_html_template(chart_data_json, len(articles), data_filename)
             
             # 生成JS文件路径
             js_filename = "html_viewer_core.js"
@@ -276,8 +384,7 @@ class HTMLViewerGenerator:
                     safe_print(f"警告: 无法复制JS文件: {e}", self.verbose)
             
             # 写入HTML文件
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            _write_json_between(output_file, html_head, initial_articles, html_tail)
                 
             safe_print(f"已生成HTML文件: {output_file}", True)
             return True
@@ -285,14 +392,15 @@ class HTMLViewerGenerator:
             safe_print(f"生成HTML文件失败: {str(e)}", True)
             return False
 
-    def _generate_html_template(self, articles_json, chart_data_json):
+    def _generate_html_template(self, chart_data_json, total_articles, data_filename=None):
         """
         生成HTML模板
         Args:
-            articles_json: 文章JSON字符串
             chart_data_json: 图表数据JSON字符串
+            total_articles: 文章总数
+            data_filename: 完整文章数据脚本的文件名，HTML内嵌全部文章时为None
         Returns:
-            HTML内容字符串
+            (head, tail): 文章JSON插入点之前和之后的HTML内容字符串
         """
         dark_mode = 'dark' if self.config['dark_mode'] else 'light'
         
@@ -307,7 +415,7 @@ class HTMLViewerGenerator:
         default_search_field = self.config.get('default_search_field', '').strip()
         default_search_field_json = json.dumps(default_search_field)
         
-        template = f"""<!DOCTYPE html>
+        head = f"""<!DOCTYPE html>
 <html lang="zh-CN" data-bs-theme="{dark_mode}">
 <head>
     <meta charset="UTF-8">
@@ -418,7 +526,10 @@ class HTMLViewerGenerator:
     <!-- 为JavaScript提供数据 -->
     <script>
         // 注入数据到全局变量
-        var ARTICLES_DATA = {articles_json};
+        var ARTICLES_DATA = """
+        tail = f""";
+        var ARTICLES_TOTAL = {total_articles};
+        var ARTICLES_DATA_FILE = {json.dumps(data_filename)};
         var CHART_DATA = {chart_data_json};
         var ARTICLES_PER_PAGE = {self.config['articles_per_page']};
         var DEFAULT_VISIBLE_COLUMNS = {default_visible_columns_json};
@@ -438,7 +549,7 @@ class HTMLViewerGenerator:
 </body>
 </html>
 """
-        return template
+        return head, tail
 
     def process(self):
         safe_print("开始生成HTML文献浏览器...", True)
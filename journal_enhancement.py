@@ -13,6 +13,11 @@ from tqdm import tqdm
 import threading
 import traceback  # 添加导入
 
+from utils import console_print, parse_bool
+
+# 非详细模式下仍需输出的重要消息关键词
+_IMPORTANT_RE = re.compile("成功|完成|错误|失败|警告")
+
 # 导入日志工具，如果可用
 try:
     from log_utils import get_logger, init_logger
@@ -26,17 +31,10 @@ except ImportError:
         """安全打印，处理编码问题"""
         if not verbose:
             # 检查是否为重要消息
-            if not any(key in msg for key in ["成功", "完成", "错误", "失败", "警告"]):
+            if not _IMPORTANT_RE.search(msg):
                 return
                 
-        try:
-            print(msg)
-            import sys
-            sys.stdout.flush()
-        except:
-            print(str(msg).encode('utf-8', 'ignore').decode('utf-8', 'ignore'))
-            import sys
-            sys.stdout.flush()
+        console_print(msg)
 
 # 导入可视化模块（如果可用）
 try:
@@ -46,6 +44,16 @@ except ImportError:
     VISUALIZATION_AVAILABLE = False
 
 class JournalEnhancer:
+    # 需要类型转换的配置项：键 -> 转换函数，其余已知键按字符串保存
+    _CONFIG_CONVERTERS = {
+        'journal_max_workers': int,
+        'journal_batch_size': int,
+        'journal_cache_enabled': parse_bool,
+        'journal_preload_similarity': parse_bool,
+        'viz_enabled': parse_bool,
+        'journal_match_threshold': float,
+    }
+    
     def __init__(self, config_file="pub.txt", verbose=False, log_file=None):
         """初始化期刊信息增强处理工具
         
@@ -71,6 +79,10 @@ class JournalEnhancer:
         # 然后再读取配置和加载期刊数据
         self.config = self._read_config(config_file)
         
+        # 匹配热路径上反复使用的配置项，读取一次后保存为属性
+        self.cache_enabled = self.config.get('journal_cache_enabled', True)
+        self.match_threshold = self.config.get('journal_match_threshold', 0.7)
+        
         # 计时加载期刊数据
         start_time = time.time()
         self.journal_data = self._load_journal_data()
@@ -115,36 +127,35 @@ class JournalEnhancer:
         
         try:
             if os.path.exists(config_file):
+                seen_keys = set()  # 配置文件中已出现的键，用于检查缺失项
                 with open(config_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            parts = line.split('=', 1)
-                            if len(parts) == 2:
-                                key, value = parts
-                                key = key.strip()
-                                value = value.split('#', 1)[0].strip()  # 移除注释
-                                
-                                # 标准参数
-                                if key in config:
-                                    # 处理数值型或布尔型参数
-                                    if key in ['journal_max_workers', 'journal_batch_size']:
-                                        try:
-                                            config[key] = int(value)
-                                        except ValueError:
-                                            pass
-                                    elif key in ['journal_cache_enabled', 'journal_preload_similarity', 'viz_enabled']:
-                                        config[key] = value.lower() in ['true', 'yes', 'y', '1']
-                                    elif key == 'journal_match_threshold':
-                                        try:
-                                            config[key] = float(value)
-                                        except ValueError:
-                                            pass
-                                    else:
-                                        config[key] = value
+                    lines = f.read().splitlines()
+                
+                for line in lines:
+                    line = line.strip()
+                    if not line or line[0] == '#':
+                        continue
+                    key, sep, value = line.partition('=')
+                    if not sep:
+                        continue
+                    key = key.strip()
+                    value = value.partition('#')[0].strip()  # 移除注释
+                    seen_keys.add(key)
+                    
+                    # 标准参数
+                    if key in config:
+                        # 处理数值型或布尔型参数
+                        converter = self._CONFIG_CONVERTERS.get(key)
+                        if converter:
+                            try:
+                                config[key] = converter(value)
+                            except ValueError:
+                                pass
+                        else:
+                            config[key] = value
                 
                 # 检查是否缺少配置项
-                self._check_and_update_config(config_file, config)
+                self._check_and_update_config(config_file, config, seen_keys)
                 safe_print(f"已从 {config_file} 加载排序和期刊数据配置", self.verbose)
             else:
                 safe_print(f"配置文件 {config_file} 不存在，使用默认设置", self.verbose)
@@ -156,21 +167,27 @@ class JournalEnhancer:
         
         return config
     
-    def _update_config_file(self, config_file, config):
-        """更新现有配置文件，添加排序和期刊数据相关设置"""
+    def _update_config_file(self, config_file, config, existing_keys=None):
+        """更新现有配置文件，添加排序和期刊数据相关设置
+        
+        Args:
+            config_file: 配置文件路径
+            config: 当前配置字典
+            existing_keys: 配置文件中已有的键集合，为None时重新读取配置文件
+        """
         try:
             # 检查文件是否存在
             if os.path.exists(config_file):
-                # 读取现有配置内容
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                
-                # 检查是否已有这些配置项
-                existing_keys = set()
-                for line in lines:
-                    if '=' in line and not line.strip().startswith('#'):
-                        key = line.split('=', 1)[0].strip()
-                        existing_keys.add(key)
+                if existing_keys is None:
+                    # 读取现有配置内容，检查是否已有这些配置项
+                    with open(config_file, 'r', encoding='utf-8') as f:
+                        lines = f.readlines()
+                    
+                    existing_keys = set()
+                    for line in lines:
+                        if '=' in line and not line.strip().startswith('#'):
+                            key = line.split('=', 1)[0].strip()
+                            existing_keys.add(key)
                 
                 # 准备新的配置项
                 new_config = []
@@ -256,9 +273,15 @@ class JournalEnhancer:
         except Exception as e:
             safe_print(f"更新配置文件出错: {e}", self.verbose)
     
-    def _check_and_update_config(self, config_file, config):
-        """检查并更新配置文件，检查是否缺少新的高级配置项"""
-        self._update_config_file(config_file, config)  # 直接使用更新函数
+    def _check_and_update_config(self, config_file, config, seen_keys):
+        """检查并更新配置文件，检查是否缺少新的高级配置项
+        
+        Args:
+            config_file: 配置文件路径
+            config: 当前配置字典
+            seen_keys: 读取配置时已解析到的键集合
+        """
+        self._update_config_file(config_file, config, seen_keys)  # 复用解析结果，避免再次读取文件
     
     def _load_journal_data(self):
         """加载期刊影响因子和分区数据"""
@@ -490,7 +513,7 @@ class JournalEnhancer:
             return None
         
         # 检查缓存
-        cache_enabled = self.config.get('journal_cache_enabled', True)
+        cache_enabled = self.cache_enabled
         if cache_enabled:
             with self.lock:
                 if journal_name in self.journal_name_cache:
@@ -512,9 +535,10 @@ class JournalEnhancer:
             return result
         
         # 尝试使用去掉括号的名称匹配
+        journal_name_no_paren_lower = journal_name_no_paren.lower()
         for journal in self.journal_data.keys():
             # 如果去掉括号后的期刊名称完全匹配数据库中的某个期刊
-            if journal_name_no_paren.lower() == journal.lower():
+            if journal_name_no_paren_lower == journal.lower():
                 result = self._extract_journal_info(journal)
                 if cache_enabled and result:
                     with self.lock:
@@ -522,9 +546,8 @@ class JournalEnhancer:
                 return result
         
         # 尝试模糊匹配
-        match_threshold = self.config.get('journal_match_threshold', 0.7)
         best_match = None
-        highest_similarity = match_threshold  # 设置一个相似度阈值
+        highest_similarity = self.match_threshold  # 设置一个相似度阈值
         
         # 遍历所有期刊名称
         for journal in self.journal_data.keys():
@@ -600,7 +623,7 @@ class JournalEnhancer:
         
         # 检查缓存
         cache_key = f"{s1}||{s2}"
-        cache_enabled = self.config.get('journal_cache_enabled', True)
+        cache_enabled = self.cache_enabled
         if cache_enabled:
             with self.lock:
                 if cache_key in self.similarity_cache:
@@ -812,8 +835,8 @@ class JournalEnhancer:
         try:
             # 确保输出目录存在
             output_dir = os.path.dirname(file_path)
-            if output_dir and not os.path.exists(output_dir):
-                os.makedirs(output_dir)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
             
             # 获取所有列名
             fieldnames = []
@@ -3,7 +3,6 @@
 提供将期刊影响因子和分区信息可视化的功能
 """
 import os
-import sys
 import csv
 import re
 import traceback
@@ -16,6 +15,8 @@ import matplotlib.pyplot as plt
 import matplotlib.colors
 import numpy as np
 
+from utils import console_print
+
 # 导入词云图所需库
 try:
     from wordcloud import WordCloud, STOPWORDS
@@ -37,6 +38,9 @@ try:
 except Exception as e:
     print(f"警告: 设置matplotlib字体失败: {e}")
 
+# 非详细模式下仍需输出的重要消息关键词
+_IMPORTANT_RE = re.compile("成功|完成|错误|失败|警告|生成图表|可视化|初始化")
+
 # 导入日志工具，如果可用
 try:
     from log_utils import get_logger, init_logger
@@ -49,18 +53,10 @@ except ImportError:
     def safe_print(msg, verbose=True):
         """安全打印，处理编码问题"""
         if not verbose:
-            if not any(key in msg for key in ["成功", "完成", "错误", "失败", "警告", "生成图表", "可视化", "初始化"]):
+            if not _IMPORTANT_RE.search(msg):
                 return
 
-        try:
-            print(msg)
-            sys.stdout.flush()
-        except:
-            try:
-                print(str(msg).encode('utf-8', 'ignore').decode('utf-8', 'ignore'))
-                sys.stdout.flush()
-            except Exception as e_print:
-                print(f"Fallback print failed: {e_print}")
+        console_print(msg)
 
 class JournalVisualizer:
     """期刊数据可视化工具"""
@@ -135,8 +131,7 @@ class JournalVisualizer:
         
         # 创建输出目录
         self.viz_output_dir = self.config.get('viz_output_dir', 'out/viz')
-        if not os.path.exists(self.viz_output_dir):
-            os.makedirs(self.viz_output_dir, exist_ok=True)
+        os.makedirs(self.viz_output_dir, exist_ok=True)
             
         # 设置图表主题
         self.theme = self.config.get('viz_color_theme', 'default')
@@ -176,6 +171,7 @@ class JournalVisualizer:
         
         try:
             if os.path.exists(config_file):
+                seen_keys = set()  # 配置文件中已出现的键，用于检查缺失项
                 with open(config_file, 'r', encoding='utf-8') as f:
                     for line in f:
                         line = line.strip()
@@ -185,6 +181,7 @@ class JournalVisualizer:
                                 key, value = parts
                                 key = key.strip()
                                 value = value.split('#', 1)[0].strip()
+                                seen_keys.add(key)
                                 
                                 if key in ['viz_enabled', 'viz_show_if', 'viz_show_quartile', 
                                            'viz_show_journals', 'viz_show_years', 'viz_show_wordcloud', 'viz_interactive']:
@@ -220,7 +217,7 @@ class JournalVisualizer:
                     config['expected_year_range'] = max(1, int(config['time_period'] + 0.5))
                     safe_print(f"根据时间周期设置预期年份范围: {config['expected_year_range']}年", self.verbose)
                 
-                self._check_and_update_config(config_file, config)
+                self._check_and_update_config(config_file, config, seen_keys)
                 
                 safe_print("已从配置文件加载可视化设置", self.verbose)
             else:
@@ -243,8 +240,14 @@ class JournalVisualizer:
         except Exception:
             return None
 
-    def _check_and_update_config(self, config_file, config):
-        """检查并更新配置文件，添加缺失的配置项"""
+    def _check_and_update_config(self, config_file, config, seen_keys):
+        """检查并更新配置文件，添加缺失的配置项
+        
+        Args:
+            config_file: 配置文件路径
+            config: 当前配置字典
+            seen_keys: 读取配置时已解析到的键集合
+        """
         needed_params = {
             'viz_enabled': '# 是否启用可视化功能(yes/no)\nviz_enabled=yes\n\n',
             'viz_output_dir': '# 可视化输出目录\nviz_output_dir=out/viz\n\n',
@@ -267,13 +270,8 @@ class JournalVisualizer:
         }
         
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            additions = []
-            for param, template in needed_params.items():
-                if f"{param}=" not in content:
-                    additions.append(template)
+            # 按已解析的键判断缺失项，注释行中的示例不会被误认为已配置
+            additions = [template for param, template in needed_params.items() if param not in seen_keys]
             
             if additions:
                 with open(config_file, 'a', encoding='utf-8') as f:
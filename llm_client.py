@@ -126,7 +126,9 @@ class LLMClient:
             self.request_count += 1
             request_id = self.request_count
             
-        safe_print(f"API请求 #{request_id}: 发送 {total_input} tokens", verbose)
+        # 以下非关键消息在非详细模式下会被丢弃，提前判断以免白白格式化字符串
+        if verbose:
+            safe_print(f"API请求 #{request_id}: 发送 {total_input} tokens", verbose)
         
         for attempt in range(retries):
             try:
@@ -134,7 +136,8 @@ class LLMClient:
                 
                 # 设置动态超时：基础超时 + 每1000 token增加10秒
                 dynamic_timeout = timeout + (total_input / 1000) * 10
-                safe_print(f"API请求 #{request_id} 设置动态超时: {dynamic_timeout:.1f}秒", verbose)
+                if verbose:
+                    safe_print(f"API请求 #{request_id} 设置动态超时: {dynamic_timeout:.1f}秒", verbose)
                 
                 response = self.client.chat.completions.create(
                     model=model,
@@ -157,7 +160,8 @@ class LLMClient:
                 
                 elapsed_time = time.time() - start_time
                 safe_print(f"API请求 #{request_id} 完成，耗时: {elapsed_time:.2f}秒", verbose)
-                safe_print(f"请求 #{request_id}: 输入{total_input}个token, 输出{output_tokens}个token", verbose)
+                if verbose:
+                    safe_print(f"请求 #{request_id}: 输入{total_input}个token, 输出{output_tokens}个token", verbose)
                 
                 return result
                 
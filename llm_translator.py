@@ -3,6 +3,7 @@
 提供文献内容翻译、理解和处理的核心功能
 """
 import os
+import re
 import time
 import json
 import concurrent.futures
@@ -23,6 +24,10 @@ except ImportError:
 # 导入错误处理工具
 from error_handler import retry, safe_file_operation, ErrorTracker, safe_print
 
+# 翻译结果清理用的正则表达式，模块加载时编译一次
+_PREFIX_RE = re.compile(r'^.*?[:：]\s*')  # "翻译:"、"翻译结果:"等前缀
+_QUOTES_RE = re.compile(r'^[\s"「\']+|[\s"」\']+$')  # 首尾引号
+
 class TranslationCache:
     """翻译缓存，避免重复翻译"""
     
@@ -47,10 +52,12 @@ class TranslationCache:
     def load_cache(self):
         """从文件加载缓存"""
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    self.cache = json.load(f)
-                safe_print(f"已从 {self.cache_file} 加载 {len(self.cache)} 条翻译缓存", False)
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+            safe_print(f"已从 {self.cache_file} 加载 {len(self.cache)} 条翻译缓存", False)
+        except FileNotFoundError:
+            # 首次运行时缓存文件尚未创建
+            pass
         except Exception as e:
             ErrorTracker().track_error(
                 "CacheLoadError", 
@@ -295,11 +302,10 @@ class LLMTranslator:
             return ""
             
         # 删除"翻译:"、"翻译结果:"等前缀
-        import re
-        text = re.sub(r'^.*?[:：]\s*', '', text)
+        text = _PREFIX_RE.sub('', text)
         
         # 删除引号
-        text = re.sub(r'^[\s"「\']+|[\s"」\']+$', '', text)
+        text = _QUOTES_RE.sub('', text)
         
         return text.strip()
         
@@ -414,11 +420,10 @@ class LLMTranslator:
             return ""
         
         # 构建用于提取关键词的内容
-        content = ""
-        if title:
-            content += f"标题: {title}\n\n"
-        if abstract:
-            content += f"摘要: {abstract}\n\n"
+        content = "".join([
+            f"标题: {title}\n\n" if title else "",
+            f"摘要: {abstract}\n\n" if abstract else "",
+        ])
             
         # 构建系统提示
         system_prompt = "你是一位擅长文献分析的学术助手，专精于从学术文章中提取关键词和主题。"
@@ -13,6 +13,7 @@ from datetime import datetime
 # 导入错误处理工具和翻译核心模块
 from error_handler import ErrorTracker, safe_print, safe_file_operation
 from llm_translator import LLMTranslator
+from utils import parse_bool
 
 # 不直接将LLMTranslator作为别名，而是创建一个适配器类
 # LiteratureTranslator = LLMTranslator
@@ -68,6 +69,25 @@ class LiteratureTranslator:
 class LiteratureProcessor:
     """文献处理工具，整合读取、翻译和输出功能"""
     
+    # 配置项定义: 键 -> (类型转换函数, 默认值)
+    _CONFIG_SCHEMA = {
+        'input_llm': (str, 'pubmed_enhanced.csv'),
+        'output_llm': (str, 'pubmed_enhanced_llm.csv'),
+        'max_articles': (int, 5),
+        'ai_model': (str, 'qwen-plus'),
+        'ai_timeout': (float, 60),
+        'retry_times': (int, 3),
+        'api_key': (str, ''),
+        'api_base_url': (str, 'https://dashscope.aliyuncs.com/compatible-mode/v1'),
+        'api_price_input': (float, 20.0),
+        'api_price_output': (float, 200.0),
+        'optimize_keywords': (parse_bool, False),
+        'translation_batch_size': (int, 5),
+        'max_parallel_requests': (int, 3),
+        'use_translation_cache': (parse_bool, True),
+        'cache_file': (str, 'cache/translation_cache.json'),
+    }
+    
     def __init__(self, config_file="pub.txt", verbose=False, log_file=None):
         """初始化文献处理工具
         
@@ -98,23 +118,7 @@ class LiteratureProcessor:
             配置字典
         """
         # 默认配置
-        config = {
-            'input_llm': 'pubmed_enhanced.csv',
-            'output_llm': 'pubmed_enhanced_llm.csv',
-            'max_articles': 5,
-            'ai_model': 'qwen-plus',
-            'ai_timeout': 60,
-            'retry_times': 3,
-            'api_key': '',
-            'api_base_url': 'https://dashscope.aliyuncs.com/compatible-mode/v1',
-            'api_price_input': 20.0,
-            'api_price_output': 200.0,
-            'optimize_keywords': False,
-            'translation_batch_size': 5,
-            'max_parallel_requests': 3,
-            'use_translation_cache': True,
-            'cache_file': 'cache/translation_cache.json',
-        }
+        config = {key: default for key, (_, default) in self._CONFIG_SCHEMA.items()}
         
         try:
             if os.path.exists(config_file):
@@ -127,22 +131,13 @@ class LiteratureProcessor:
                                 key = parts[0].strip()
                                 value = parts[1].strip().split('#', 1)[0].strip()
                                 
-                                if key in config:
-                                    # 根据类型转换值
-                                    if key in ['max_articles', 'translation_batch_size', 'max_parallel_requests', 'retry_times']:
-                                        try:
-                                            config[key] = int(value)
-                                        except ValueError:
-                                            pass
-                                    elif key in ['api_price_input', 'api_price_output', 'ai_timeout']:
-                                        try:
-                                            config[key] = float(value)
-                                        except ValueError:
-                                            pass
-                                    elif key in ['use_translation_cache', 'optimize_keywords']:
-                                        config[key] = value.lower() in ['true', 'yes', 'y', '1']
-                                    else:
-                                        config[key] = value
+                                spec = self._CONFIG_SCHEMA.get(key)
+                                if spec:
+                                    # 根据类型转换值，转换失败时保留默认值
+                                    try:
+                                        config[key] = spec[0](value)
+                                    except ValueError:
+                                        pass
                 
                 self._ensure_config(config_file, config)
                 safe_print(f"已从 {config_file} 加载配置", self.verbose)
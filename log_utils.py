@@ -25,8 +25,8 @@ class Logger:
         # 如果指定了日志文件，则确保目录存在
         if log_file:
             log_dir = os.path.dirname(log_file)
-            if log_dir and not os.path.exists(log_dir):
-                os.makedirs(log_dir)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
                 
             # 添加日志文件头部
             with open(log_file, 'a', encoding='utf-8') as f:
@@ -43,20 +43,19 @@ class Logger:
             level: 日志级别(INFO, WARNING, ERROR, SUCCESS, DEBUG)
         """
         with self.lock:
-            # 格式化日志消息
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            # 格式化日志消息（time.strftime无需构造datetime对象，每条日志都会调用）
+            timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
             level_str = f"[{level}]" if level else ""
             formatted_msg = f"{timestamp} {level_str} {msg}"
             
-            # 输出到终端
+            # 输出到终端（与utils.console_print相同：行缓冲的终端无需逐条刷新，仅在输出被重定向时显式刷新）
             if self.verbose or always_print:
+                flush = not getattr(sys.stdout, 'line_buffering', False)
                 try:
-                    print(msg)
-                    sys.stdout.flush()
+                    print(msg, flush=flush)
                 except:
                     # 处理编码问题
-                    print(str(msg).encode('utf-8', 'ignore').decode('utf-8', 'ignore'))
-                    sys.stdout.flush()
+                    print(str(msg).encode('utf-8', 'ignore').decode('utf-8', 'ignore'), flush=flush)
             
             # 输出到文件
             if self.log_file:
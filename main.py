@@ -413,6 +413,37 @@ class PubMedProcessor:
         finally:
             ProgressDisplay.stop()
 
+# 配置文件解析缓存: {配置文件路径: ((mtime_ns, size), 配置字典)}
+_CONFIG_CACHE = {}
+
+def _load_config_values(config_file):
+    """解析配置文件为字典，文件未修改时复用上次的解析结果
+
+    Args:
+        config_file: 配置文件路径
+
+    Returns:
+        配置字典
+    """
+    stat = os.stat(config_file)
+    cache_key = (stat.st_mtime_ns, stat.st_size)
+    cached = _CONFIG_CACHE.get(config_file)
+    if cached and cached[0] == cache_key:
+        return cached[1]
+
+    values = {}
+    with open(config_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                parts = line.split('=', 1)
+                if len(parts) == 2:
+                    # 与原逻辑一致: 同名键以第一次出现为准
+                    values.setdefault(parts[0].strip(), parts[1].strip().split('#', 1)[0].strip())
+
+    _CONFIG_CACHE[config_file] = (cache_key, values)
+    return values
+
 def _get_config_value(config_file, key, default_value):
     """从配置文件中获取指定键的值
     
@@ -425,14 +456,7 @@ def _get_config_value(config_file, key, default_value):
         配置值或默认值
     """
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    parts = line.split('=', 1)
-                    if len(parts) == 2 and parts[0].strip() == key:
-                        return parts[1].strip().split('#', 1)[0].strip()
-        return default_value
+        return _load_config_values(config_file).get(key, default_value)
     except Exception:
         return default_value
 
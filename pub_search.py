@@ -18,6 +18,7 @@ from pubmed_core import (
     build_date_filter, get_entrez_sort_param, remove_html_tags, 
     extract_publication_date, safe_create_dir
 )
+from utils import parse_bool
 from search_enhancer import SearchEnhancer
 
 # 导入日志工具，如果可用
@@ -27,6 +28,15 @@ except ImportError:
     pass
 
 class PubMedFetcher:
+    # 需要类型转换的配置项：键 -> (转换函数, 转换失败时的警告模板)
+    _CONFIG_CONVERTERS = {
+        'time_period': (float, "警告: 无效的时间周期值: {}，使用默认值: 3.0"),
+        'max_results': (int, "警告: 无效的最大结果数: {}，使用默认值: 50"),
+        'get_citations': (parse_bool, None),
+        'enhance_query': (parse_bool, None),
+        'ai_timeout': (int, "警告: 无效的AI超时设置: {}，使用默认值: 30秒"),
+    }
+    
     def __init__(self, email=None, config_file="pub.txt", verbose=False, log_file=None):
         """初始化PubMed检索工具
         
@@ -75,6 +85,7 @@ class PubMedFetcher:
         
         try:
             if os.path.exists(config_file):
+                seen_keys = set()  # 配置文件中已出现的键，用于检查缺失项
                 with open(config_file, 'r', encoding='utf-8') as f:
                     for line in f:
                         line = line.strip()
@@ -82,33 +93,22 @@ class PubMedFetcher:
                             parts = line.split('=', 1)
                             if len(parts) == 2:
                                 key, value = parts[0].strip(), parts[1].strip()
+                                seen_keys.add(key)
                                 
-                                # 处理数值型配置
-                                if key == 'time_period':
-                                    try:
-                                        config['time_period'] = float(value)
-                                    except ValueError:
-                                        safe_print(f"警告: 无效的时间周期值: {value}，使用默认值: 3.0")
-                                elif key == 'max_results':
-                                    try:
-                                        config['max_results'] = int(value)
-                                    except ValueError:
-                                        safe_print(f"警告: 无效的最大结果数: {value}，使用默认值: 50")
-                                elif key == 'get_citations':
-                                    config['get_citations'] = value.lower() in ['true', 'yes', 'y', '1']
-                                elif key == 'enhance_query':
-                                    config['enhance_query'] = value.lower() in ['true', 'yes', 'y', '1']
-                                elif key == 'ai_timeout':
+                                # 处理数值型和布尔型配置
+                                converter = self._CONFIG_CONVERTERS.get(key)
+                                if converter:
+                                    convert, warning = converter
                                     try:
-                                        config['ai_timeout'] = int(value)
+                                        config[key] = convert(value)
                                     except ValueError:
-                                        safe_print(f"警告: 无效的AI超时设置: {value}，使用默认值: 30秒")
+                                        safe_print(warning.format(value))
                                 # 处理字符串型配置
                                 elif key in config:
                                     config[key] = value
                 
                 # 检查是否缺少配置项
-                self._check_and_update_config(config_file, config)
+                self._check_and_update_config(config_file, seen_keys)
                 safe_print(f"已从 {config_file} 加载配置")
             else:
                 safe_print(f"配置文件 {config_file} 不存在，使用默认设置")
@@ -119,8 +119,13 @@ class PubMedFetcher:
         
         return config
     
-    def _check_and_update_config(self, config_file, config):
-        """检查并更新配置文件，添加缺失的配置项"""
+    def _check_and_update_config(self, config_file, seen_keys):
+        """检查并更新配置文件，添加缺失的配置项
+        
+        Args:
+            config_file: 配置文件路径
+            seen_keys: 读取配置时已解析到的键集合
+        """
         needed_params = {
             'enhance_query': '# 是否润色搜索词(yes/no)\nenhance_query=no\n\n',
             'ai_model': '# 用于润色搜索词的AI模型\nai_model=qwen-turbo\n\n',
@@ -129,15 +134,8 @@ class PubMedFetcher:
         }
         
         try:
-            # 读取当前配置文件内容
-            with open(config_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             # 检查并添加缺失的配置项
-            additions = []
-            for param, template in needed_params.items():
-                if f"{param}=" not in content:
-                    additions.append(template)
+            additions = [template for param, template in needed_params.items() if param not in seen_keys]
             
             # 如果有需要添加的内容，向文件末尾追加
             if additions:
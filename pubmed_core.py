@@ -8,19 +8,14 @@ import datetime
 import random
 import os
 
+from utils import console_print
+
 def safe_print(msg, verbose=True):
     """安全打印，处理编码问题"""
     if not verbose:
         return
         
-    try:
-        print(msg)
-        import sys
-        sys.stdout.flush()
-    except:
-        print(str(msg).encode('utf-8', 'ignore').decode('utf-8', 'ignore'))
-        import sys
-        sys.stdout.flush()
+    console_print(msg)
 
 def retry_function(func, max_retries=3, delay=1):
     """重试执行函数
@@ -8,6 +8,8 @@ import json
 import concurrent.futures
 from openai import OpenAI
 
+from utils import console_print
+
 # 导入日志工具，如果可用
 try:
     from log_utils import get_logger, init_logger
@@ -24,14 +26,7 @@ except ImportError:
         if not verbose:
             return
                 
-        try:
-            print(msg)
-            import sys
-            sys.stdout.flush()
-        except:
-            print(str(msg).encode('utf-8', 'ignore').decode('utf-8', 'ignore'))
-            import sys
-            sys.stdout.flush()
+        console_print(msg)
 
 class SearchEnhancer:
     """通过AI优化PubMed搜索关键词"""
@@ -0,0 +1,62 @@
+"""
+error_handler模块测试
+"""
+import os
+import sys
+import time
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import error_handler
+from error_handler import ErrorTracker
+
+
+class ErrorTrackerReportTest(unittest.TestCase):
+    def setUp(self):
+        # 每个测试使用新的单例实例
+        ErrorTracker._instance = None
+        self.tracker = ErrorTracker()
+
+    def tearDown(self):
+        ErrorTracker._instance = None
+
+    def test_track_error_not_blocked_while_report_is_generated(self):
+        report_started = threading.Event()
+        release_report = threading.Event()
+
+        def slow_print(msg, verbose=True):
+            # 模拟输出报告很慢：报告线程在此等待，直到测试放行
+            if "错误报告" in msg:
+                report_started.set()
+                release_report.wait(5)
+
+        # 第一次记录错误时报告到期，之后的记录不再触发报告
+        self.tracker._report_interval = 1000
+        self.tracker._last_report_time = time.monotonic() - 2000
+
+        with mock.patch.object(error_handler, "safe_print", slow_print):
+            reporter = threading.Thread(
+                target=self.tracker.track_error, args=("SlowReport", "触发报告", "test", "WARNING")
+            )
+            reporter.start()
+            try:
+                self.assertTrue(report_started.wait(5), "报告未开始生成")
+
+                other = threading.Thread(
+                    target=self.tracker.track_error, args=("Other", "并发记录", "test", "WARNING")
+                )
+                other.start()
+                other.join(2)
+                self.assertFalse(other.is_alive(), "生成报告期间track_error被阻塞")
+            finally:
+                release_report.set()
+                reporter.join(5)
+
+        self.assertEqual(len(self.tracker._errors), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+html_viewer_core模块测试
+"""
+import os
+import sys
+import types
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_viewer_core import HTMLViewerGenerator
+
+
+class ReadConfigTest(unittest.TestCase):
+    def test_output_dir_created_on_every_read(self):
+        # 配置解析结果被缓存时，创建输出目录的副作用仍须每次执行
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_dir = os.path.join(tmp_dir, "viz")
+            config_file = os.path.join(tmp_dir, "pub.txt")
+            with open(config_file, "w", encoding="utf-8") as f:
+                f.write(f"viz_output_dir={output_dir}\n")
+
+            for _ in range(2):
+                generator = HTMLViewerGenerator(config_file=config_file)
+                self.assertTrue(os.path.isdir(output_dir))
+                self.assertEqual(generator.config['output_html'], os.path.join(output_dir, 'literature_viewer.html'))
+                os.rmdir(output_dir)
+
+
+class ReadArticlesFromCsvTest(unittest.TestCase):
+    def setUp(self):
+        self.generator = HTMLViewerGenerator(config_file=os.devnull)
+        fd, self.csv_path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("title,pmid,date\na\nb,2,2020-01-01 10:00\n")
+        self.addCleanup(os.remove, self.csv_path)
+
+    def test_falls_back_to_csv_module_when_pandas_fails(self):
+        broken_pandas = types.ModuleType("pandas")
+
+        def read_csv(*args, **kwargs):
+            raise ValueError("解析失败")
+
+        broken_pandas.read_csv = read_csv
+        with mock.patch.dict(sys.modules, {"pandas": broken_pandas}):
+            articles = self.generator.read_articles_from_csv(self.csv_path)
+
+        self.assertEqual(articles[1], {'title': 'b', 'pmid': '2', 'date': '2020-01-01 10:00'})
+
+    def test_short_rows_padded_to_header(self):
+        # 与pandas一致：较短的行补齐为空字符串，后续按第一行的列名检测时间字段
+        with mock.patch.dict(sys.modules, {"pandas": None}):
+            articles = self.generator.read_articles_from_csv(self.csv_path)
+
+        self.assertEqual(articles[0], {'title': 'a', 'pmid': '', 'date': ''})
+        processed, chart_data = self.generator.preprocess_data(articles)
+        self.assertEqual(processed[1]['year'], '2020')
+        self.assertEqual(chart_data['time_field'], 'date')
+        self.assertEqual(chart_data['time'], {'2020-01-01': 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+utils模块测试
+"""
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import console_print
+
+
+class _RecordingStream(io.StringIO):
+    """记录flush调用次数的输出流"""
+
+    def __init__(self, line_buffering):
+        super().__init__()
+        self._line_buffering = line_buffering
+        self.flush_count = 0
+
+    @property
+    def line_buffering(self):
+        return self._line_buffering
+
+    def flush(self):
+        self.flush_count += 1
+        super().flush()
+
+
+class ConsolePrintTest(unittest.TestCase):
+    def test_flush_only_when_stdout_is_not_line_buffered(self):
+        for line_buffering, expected_flushes in ((True, 0), (False, 1)):
+            with self.subTest(line_buffering=line_buffering):
+                stream = _RecordingStream(line_buffering)
+                with mock.patch.object(sys, "stdout", stream):
+                    console_print("消息")
+                self.assertEqual(stream.getvalue(), "消息\n")
+                self.assertEqual(stream.flush_count, expected_flushes)
+
+    def test_explicit_flush_overrides_buffering_rule(self):
+        for line_buffering, flush, expected_flushes in ((True, True, 1), (False, False, 0)):
+            with self.subTest(line_buffering=line_buffering, flush=flush):
+                stream = _RecordingStream(line_buffering)
+                with mock.patch.object(sys, "stdout", stream):
+                    console_print("消息", flush=flush)
+                self.assertEqual(stream.flush_count, expected_flushes)
+
+
+if __name__ == "__main__":
+    unittest.main()
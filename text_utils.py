@@ -6,6 +6,20 @@ import os
 import csv
 import re
 
+from utils import console_print
+
+# 翻译结果后处理用的正则表达式，模块加载时编译一次
+_TRANSLATION_PREFIX_RE = re.compile(r'^.*?[:：]\s*')  # "翻译结果："等前缀
+_TRANSLATION_QUOTES_RE = re.compile(r'^\s*[""「]\s*|\s*[""」]\s*$')  # 首尾引号
+_KEYWORD_PREFIX_RES = (
+    re.compile(r'^.*?关键词[:：]\s*'),  # "处理后的关键词:"等前缀
+    re.compile(r'^处理后的关键词[:：]\s*'),
+    re.compile(r'^优化后的关键词[:：]\s*'),
+)
+
+# 非详细模式下仍需输出的重要消息关键词
+_IMPORTANT_RE = re.compile("成功|完成|错误|失败|警告")
+
 try:
     from log_utils import get_logger
     
@@ -14,7 +28,7 @@ try:
         logger = get_logger()
         if not verbose:
             # 检查是否为重要消息
-            if not any(key in msg for key in ["成功", "完成", "错误", "失败", "警告"]):
+            if not _IMPORTANT_RE.search(msg):
                 return
         logger.log(msg, verbose)
 except ImportError:
@@ -22,17 +36,10 @@ except ImportError:
         """安全打印，处理编码问题"""
         if not verbose:
             # 检查是否为重要消息
-            if not any(key in msg for key in ["成功", "完成", "错误", "失败", "警告"]):
+            if not _IMPORTANT_RE.search(msg):
                 return
                 
-        try:
-            print(msg)
-            import sys
-            sys.stdout.flush()
-        except:
-            print(str(msg).encode('utf-8', 'ignore').decode('utf-8', 'ignore'))
-            import sys
-            sys.stdout.flush()
+        console_print(msg)
 
 
 class TextProcessor:
@@ -84,8 +91,8 @@ class TextProcessor:
         translation = self.api_manager.call_ai_api(prompt)
         
         # 后处理：删除可能的多余回复
-        translation = re.sub(r'^.*?[:：]\s*', '', translation)  # 移除"翻译结果："等前缀
-        translation = re.sub(r'^\s*[""「]\s*|\s*[""」]\s*$', '', translation)  # 移除引号
+        translation = _TRANSLATION_PREFIX_RE.sub('', translation)  # 移除"翻译结果："等前缀
+        translation = _TRANSLATION_QUOTES_RE.sub('', translation)  # 移除引号
         
         # 保存到缓存
         if use_cache and translation:
@@ -132,9 +139,8 @@ class TextProcessor:
         result = self.api_manager.call_ai_api(prompt)
         
         # 清理结果，删除额外说明文字
-        result = re.sub(r'^.*?关键词[:：]\s*', '', result)  # 删除"处理后的关键词:"等前缀
-        result = re.sub(r'^处理后的关键词[:：]\s*', '', result)
-        result = re.sub(r'^优化后的关键词[:：]\s*', '', result)
+        for pattern in _KEYWORD_PREFIX_RES:  # 删除"处理后的关键词:"等前缀
+            result = pattern.sub('', result)
         
         # 保存到缓存
         if use_cache and result:
@@ -152,27 +158,27 @@ class TextProcessor:
         Returns:
             TTS用的文本字符串
         """
-        result = ""
+        parts = []  # 收集各段文本，最后一次性拼接
         
         # 添加标题
         translated_title = article.get('translated_title', '')
         if translated_title:
-            result += f"标题：{translated_title}\n\n"
+            parts.append(f"标题：{translated_title}\n\n")
         
         # 添加关键词
         translated_keywords = article.get('translated_keywords', '')
         if translated_keywords:
-            result += f"关键词：{translated_keywords}\n\n"
+            parts.append(f"关键词：{translated_keywords}\n\n")
         
         # 添加摘要
         translated_abstract = article.get('translated_abstract', '')
         if translated_abstract:
-            result += f"摘要：{translated_abstract}\n\n"
+            parts.append(f"摘要：{translated_abstract}\n\n")
         
         # 添加分隔符
-        result += "=====================================\n\n"
+        parts.append("=====================================\n\n")
         
-        return result
+        return "".join(parts)
 
 
 class FileHandler:
@@ -199,8 +205,8 @@ class FileHandler:
         try:
             # 确保输出目录存在
             output_dir = os.path.dirname(output_file)
-            if output_dir and not os.path.exists(output_dir):
-                os.makedirs(output_dir)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
             
             # 获取所有列名
             fieldnames = []
@@ -233,8 +239,8 @@ class FileHandler:
         try:
             # 确保输出目录存在
             output_dir = os.path.dirname(output_file)
-            if output_dir and not os.path.exists(output_dir):
-                os.makedirs(output_dir)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
             
             with open(output_file, 'w', encoding='utf-8') as f:
                 for text in txt_output:
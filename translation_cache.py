@@ -26,10 +26,12 @@ class TranslationCache:
     def load_cache(self):
         """从文件加载缓存"""
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    self.cache = json.load(f)
-                safe_print(f"已从 {self.cache_file} 加载 {len(self.cache)} 条翻译缓存", False)
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+            safe_print(f"已从 {self.cache_file} 加载 {len(self.cache)} 条翻译缓存", False)
+        except FileNotFoundError:
+            # 首次运行时缓存文件尚未创建
+            pass
         except Exception as e:
             safe_print(f"加载翻译缓存失败: {e}", False)
             self.cache = {}
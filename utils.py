@@ -3,12 +3,32 @@
 提供日志记录、安全打印等基础功能
 """
 import os
+import re
 import sys
 import time
 import random
 import hashlib
 import threading
 
+# 非详细模式下仍需输出的重要消息关键词
+_IMPORTANT_RE = re.compile("成功|完成|错误|失败|警告|初始化|Token 使用统计")
+
+def console_print(msg, flush=None):
+    """输出到终端，处理编码问题
+    
+    终端下stdout已是行缓冲，print换行时会自动刷新；仅在输出被重定向时显式刷新。
+    
+    Args:
+        msg: 要输出的消息
+        flush: 是否立即刷新stdout；为None时按上述规则自动决定
+    """
+    if flush is None:
+        flush = not getattr(sys.stdout, 'line_buffering', False)
+    try:
+        print(msg, flush=flush)
+    except:
+        print(str(msg).encode('utf-8', 'ignore').decode('utf-8', 'ignore'), flush=flush)
+
 # 导入日志工具
 try:
     from log_utils import get_logger, init_logger
@@ -18,7 +38,7 @@ try:
         logger = get_logger()
         if not verbose:
             # 检查是否为重要消息
-            if not any(key in msg for key in ["成功", "完成", "错误", "失败", "警告", "初始化", "Token 使用统计"]):
+            if not _IMPORTANT_RE.search(msg):
                 return
         logger.log(msg, verbose)
 except ImportError:
@@ -26,15 +46,10 @@ except ImportError:
         """安全打印，处理编码问题"""
         if not verbose:
             # 检查是否为重要消息
-            if not any(key in msg for key in ["成功", "完成", "错误", "失败", "警告", "初始化", "Token 使用统计"]):
+            if not _IMPORTANT_RE.search(msg):
                 return
                 
-        try:
-            print(msg)
-            sys.stdout.flush()
-        except:
-            print(str(msg).encode('utf-8', 'ignore').decode('utf-8', 'ignore'))
-            sys.stdout.flush()
+        console_print(msg)
 
 def create_directory_if_not_exists(directory_path):
     """确保目录存在，如果不存在则创建
@@ -48,14 +63,23 @@ def create_directory_if_not_exists(directory_path):
     if not directory_path:
         return True
         
-    if not os.path.exists(directory_path):
-        try:
-            os.makedirs(directory_path)
-            return True
-        except Exception as e:
-            safe_print(f"创建目录失败: {e}", True)
-            return False
-    return True
+    try:
+        os.makedirs(directory_path, exist_ok=True)
+        return True
+    except Exception as e:
+        safe_print(f"创建目录失败: {e}", True)
+        return False
+
+def parse_bool(value):
+    """将配置值解析为布尔值
+    
+    Args:
+        value: 配置文件中的字符串值
+        
+    Returns:
+        bool: 值为true/yes/y/1（不区分大小写）时返回True
+    """
+    return value.lower() in ['true', 'yes', 'y', '1']
 
 def get_hash(text, prefix=""):
     """计算文本的哈希值